@@ -1,5 +1,6 @@
 import pymunk
 
+from elements.collision_type import CollisionType
 from elements.element import Element
 
 
@@ -16,5 +17,6 @@ class Boundary(Element):
             size=size,
             body_type=pymunk.Body.STATIC,
             group=group,
+            collision_type=CollisionType.WALL,
             color=color
         )
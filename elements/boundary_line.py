@@ -1,5 +1,6 @@
 import pymunk
 
+from elements.collision_type import CollisionType
 from elements.element import Element
 
 
@@ -7,7 +8,8 @@ class BoundaryLine(Element):
     _default_values = {
         "color": (0, 0, 0, 0),
         "body_type": pymunk.Body.STATIC,
-        "radius": 1
+        "radius": 1,
+        "collision_type": CollisionType.WALL,
     }
 
     def __init__(
@@ -1,5 +1,6 @@
 import pymunk
 
+from elements.collision_type import CollisionType
 from elements.element import Element
 
 
@@ -24,6 +25,6 @@ class Brick(Element):
             size=size,
             group=group,
             color=color,
-            collision_type=group,
+            collision_type=CollisionType.BRICK,
             **self._default_values
         )
@@ -0,0 +1,14 @@
+from enum import IntEnum
+
+
+class CollisionType(IntEnum):
+    """
+    Collision categories shared by all elements of the same kind.
+
+    Collision handlers are registered once per pair of categories, so the number of handlers does not grow with
+    the number of elements in a level.
+    """
+    DEFAULT = 0
+    WALL = 1
+    VICTORY_LINE = 2
+    BRICK = 3
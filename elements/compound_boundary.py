@@ -0,0 +1,42 @@
+import pymunk
+
+from elements.collision_type import CollisionType
+from elements.element import Element, VEC2
+
+
+class CompoundBoundary(Element):
+    def __init__(
+            self,
+            rects: list[tuple[VEC2, VEC2]],
+            color: tuple[int, int, int, int] = (144, 144, 120, 100),
+            group: int = 1
+    ):
+        """
+        Initialize a CompoundBoundary: many static boxes sharing a single static body.
+
+        :param rects (list[tuple[VEC2, VEC2]]): The (position, size) of every box, where position is the box center.
+        :param color (tuple[int, int, int, int], optional): The color of the boxes.
+        :param group (int, optional): The collision group of the boxes.
+        """
+        (position, size), *others = rects
+        super().__init__(
+            vertices=self._box_vertices(position, size),
+            body_type=pymunk.Body.STATIC,
+            group=group,
+            collision_type=CollisionType.WALL,
+            color=color
+        )
+        for position, size in others:
+            shape = pymunk.Poly(body=self.body, vertices=self._box_vertices(position, size))
+            shape.friction = self.shape.friction
+            shape.elasticity = self.shape.elasticity
+            shape.sensor = self.shape.sensor
+            shape.collision_type = self.shape.collision_type
+            shape.color = self.shape.color
+            shape.filter = self.shape.filter
+            self.shapes.append(shape)
+
+    @staticmethod
+    def _box_vertices(position: VEC2, size: VEC2) -> list[VEC2]:
+        (x, y), (w, h) = position, size
+        return [(x - w / 2, y - h / 2), (x + w / 2, y - h / 2), (x + w / 2, y + h / 2), (x - w / 2, y + h / 2)]
@@ -7,8 +7,6 @@ VEC2 = Union[tuple[float, float], list[float, float]]
 
 
 class Element:
-    items = []
-
     def __init__(
             self,
             mass: float = 1.0,
@@ -61,5 +59,4 @@ class Element:
         self.shape.collision_type = collision_type
         self.shape.color = color
         self.shape.filter = pymunk.ShapeFilter(group=group)
-
-        self.items += [self.body, self.shape]
+        self.shapes = [self.shape]
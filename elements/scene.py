@@ -0,0 +1,39 @@
+import pymunk
+
+from elements.element import Element
+
+
+class Scene:
+    """
+    Registry of the elements that belong to a single game.
+
+    Every game owns its own scene, which keeps the game's elements together with the pymunk space they
+    were added to, so games that run one after the other in the same process never share bodies or shapes.
+    """
+
+    def __init__(self, space: pymunk.Space):
+        """
+        Initialize an empty Scene.
+
+        :param space (pymunk.Space): The physics space the scene's elements are added to.
+        """
+        self.space = space
+        self.elements: list[Element] = []
+
+    def add(self, *elements: Element):
+        """
+        Register elements in the scene and add their bodies and shapes to the space.
+        """
+        self.elements.extend(elements)
+        self.space.add(*[item for element in elements for item in (element.body, *element.shapes)])
+
+    @property
+    def dynamic_bodies(self) -> list[pymunk.Body]:
+        return [element.body for element in self.elements if element.body.body_type == pymunk.Body.DYNAMIC]
+
+    def clear(self):
+        """
+        Remove every element of the scene from the space.
+        """
+        self.space.remove(*[item for element in self.elements for item in (element.body, *element.shapes)])
+        self.elements = []
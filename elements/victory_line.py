@@ -1,5 +1,6 @@
 import pymunk
 
+from elements.collision_type import CollisionType
 from elements.element import Element
 from utils.colors import Color
 
@@ -17,7 +18,7 @@ class VictoryLine(Element):
             position=position,
             size=size,
             group=group,
-            collision_type=group,
+            collision_type=CollisionType.VICTORY_LINE,
             body_type=pymunk.Body.KINEMATIC,
             color=color,
         )
@@ -0,0 +1,145 @@
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import Connection, wait
+from typing import Iterable, Type
+
+from games.game_base import GameBase
+from games.square_race_game import SquareRaceGame
+from utils.colors import Color
+from utils.level_catalog.level_catalog import LevelCatalog
+from utils.level_compiler.binary_level import BinaryLevel
+
+
+def _simulate(game_class: Type[GameBase], path: str, max_steps: int = None) -> dict:
+    """
+    Simulate a single game data file headlessly, for at most `max_steps` physics steps.
+
+    Runs inside the game's own worker process.
+    """
+    try:
+        result = game_class(recording=False, upload=False, headless=True, path=path, max_steps=max_steps).run()
+    except Exception as e:
+        return _error_row(path, repr(e))
+
+    colors = {c.value: c.name for c in Color}
+    return _error_row(path, None) | {
+        "winner": colors.get(result.winner, result.winner),
+        "frames": result.frames,
+        "collisions": result.collisions,
+        "elapsed": round(result.elapsed, 3),
+    }
+
+
+def _error_row(path: str, error) -> dict:
+    return {c: None for c in BatchRunner.COLUMNS} | {"file": os.path.basename(path), "error": error}
+
+
+def _worker(connection: Connection, game_class: Type[GameBase], path: str, max_steps: int):
+    connection.send(_simulate(game_class, path, max_steps))
+    connection.close()
+
+
+class BatchRunner:
+    """
+    Simulates many game data files in parallel, one headless game per worker process and at most `workers` games
+    at a time. A game that runs out of time or crashes its process gets an error row and does not hold up the rest.
+
+    Attributes:
+        :param game_class (Type[GameBase]): The game to simulate. Defaults to `SquareRaceGame`.
+        :param workers (int, optional): Number of games simulated at a time. Defaults to the number of CPU cores.
+        :param max_steps (int, optional): The number of physics steps after which a game ends unfinished. Defaults
+            to the game's headless limit.
+        :param timeout (float, optional): Seconds each game may run, counted from the start of its process. The
+            process of a game that takes longer is killed. Defaults to no timeout.
+    """
+    COLUMNS = ("file", "winner", "frames", "collisions", "elapsed", "error")
+
+    def __init__(self, game_class: Type[GameBase] = SquareRaceGame, workers: int = None, max_steps: int = None,
+                 timeout: float = None):
+        self.game_class = game_class
+        self.workers = workers or os.cpu_count()
+        self.max_steps = max_steps
+        self.timeout = timeout
+
+    def run(self, paths: Iterable[str]) -> list[dict]:
+        """
+        Simulate every game data file and collect the results.
+
+        :param paths: Paths of the game data files to simulate.
+        :return list[dict]: One row per file (in the given order) with the winner, finish frame, collisions count,
+            elapsed time and the error raised while simulating (or the timeout or crash), if any.
+        """
+        paths = list(paths)
+        rows = [None] * len(paths)
+        pending = iter(enumerate(paths))
+        running = {}  # Result connection -> (index, process, deadline)
+        try:
+            while True:
+                while len(running) < self.workers and (task := next(pending, None)) is not None:
+                    i, path = task
+                    reader, writer = multiprocessing.Pipe(duplex=False)
+                    process = multiprocessing.Process(
+                        target=_worker, args=(writer, self.game_class, path, self.max_steps), daemon=True)
+                    process.start()
+                    writer.close()
+                    deadline = time.monotonic() + self.timeout if self.timeout is not None else None
+                    running[reader] = (i, process, deadline)
+                if not running: return rows
+
+                deadlines = [deadline for _, _, deadline in running.values() if deadline is not None]
+                ready = wait(list(running), max(0.0, min(deadlines) - time.monotonic()) if deadlines else None)
+                now = time.monotonic()
+                for reader, (i, process, deadline) in list(running.items()):
+                    if reader in ready:
+                        try:
+                            rows[i] = reader.recv()
+                        except EOFError:  # The process died without a result
+                            process.join()
+                            rows[i] = _error_row(paths[i], f"Worker exited with code {process.exitcode}")
+                    elif deadline is not None and now >= deadline:
+                        # A stuck game never returns, so its process is killed (SDL catches SIGTERM)
+                        process.kill()
+                        rows[i] = _error_row(paths[i], f"TimeoutError({self.timeout} s)")
+                    else:
+                        continue
+                    process.join()
+                    reader.close()
+                    del running[reader]
+        finally:
+            for reader, (_, process, _) in running.items():
+                process.kill()
+                process.join()
+                reader.close()
+
+    def run_catalog(self, catalog: LevelCatalog = None) -> list[dict]:
+        """
+        Simulate every level of `game_class` in the level catalog, by game number.
+        """
+        catalog = catalog or LevelCatalog()
+        return self.run(path for _, path in catalog.levels(self.game_class.GAME_NAME))
+
+    def run_dir(self, directory: str) -> list[dict]:
+        """
+        Simulate every game data file and binary level of `game_class` in the given directory.
+        """
+        prefix = self.game_class.GAME_NAME.lower().replace(' ', '_')
+        files = sorted(f for f in os.listdir(directory)
+                       if f.startswith(prefix) and f.endswith((".json", BinaryLevel.EXTENSION)))
+        return self.run(os.path.join(directory, f) for f in files)
+
+    @classmethod
+    def format_table(cls, rows: list[dict]) -> str:
+        cells = [[str(row[c]) if row[c] is not None else "" for c in cls.COLUMNS] for row in rows]
+        widths = [max([len(c)] + [len(r[i]) for r in cells]) for i, c in enumerate(cls.COLUMNS)]
+        lines = [
+            " | ".join(c.ljust(w) for c, w in zip(cls.COLUMNS, widths)),
+            "-+-".join("-" * w for w in widths),
+            *[" | ".join(c.ljust(w) for c, w in zip(r, widths)) for r in cells],
+        ]
+        return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    runner = BatchRunner()
+    print(runner.format_table(runner.run_catalog()))
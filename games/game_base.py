@@ -1,24 +1,39 @@
 import json
+import math
 import os
 import time
 from abc import ABC
-from typing import Callable
+from typing import Callable, Optional
 
 import pygame
 import pymunk
 import pymunk.pygame_util
 
+from elements.scene import Scene
+from games.game_result import GameResult
+from utils import fonts, sounds
 from utils.colors import Color
 from utils.game_recorder.game_recorder import GameRecorder
+from utils.level_catalog.level_catalog import LevelCatalog, GAMES_DATA_DIR
+from utils.level_compiler.binary_level import BinaryLevel
 from utils.media_uploaders.reel_uploader import ReelUploader
+from utils.profiler.frame_profiler import FrameProfiler
+from utils.profiler.startup_profiler import StartupProfiler, PROFILE_DIR
+from utils.replay.replay_log import ReplayLog, REPLAY_DIR
+from utils.sounds import Sound
 
 
 class GameBase(ABC):
-    GAME_DATA_DIR = r"C:\ws\pygame_projects\utils\games_data"
+    GAME_DATA_DIR = GAMES_DATA_DIR
     SCREEN_STR, CLOCK_STR, SPACE_STR, LOGO_STR = "screen", "clock", "space", "logo"
     SIZE_STR, COLOR_STR, FPS_STR, GRAVITY_STR, STEP_STR, POSITION_STR = "size", "color", "fps", "gravity", "step", "position"
+    MAX_SUBSTEPS = 10  # Physics steps per rendered frame when catching up with a slow frame
+    MAX_HEADLESS_SECONDS = 600  # Game time after which a headless game that is not finished is ended
+    MAX_SOUND_EVENTS = 100_000  # Sound events logged per game; later sounds are still played but not logged
 
-    def __init__(self, name: str, n: int = -1, recording: bool = True, upload: bool = True):
+    def __init__(self, name: str, n: int = -1, recording: bool = True, upload: bool = True, headless: bool = False,
+                 path: str = None, replay: bool = False, audio: bool = True, profile: bool = False,
+                 profile_overlay: bool = False, max_steps: int = None):
         """
         Game Base Class
 
@@ -29,52 +44,119 @@ class GameBase(ABC):
                 The name of the game.
             :param n: int, optional
                 The game number. Defaults to -1, which corresponds to the last saved game number
-                in the `games_data` folder with the same game name.
+                of the game in the level catalog.
             :param recording: bool, optional
-                Enables game recording. If set to `True`, the game will be recorded as it runs.
+                Enables game recording. If set to `True`, every frame of the game is captured from the screen
+                surface and encoded to an MP4 file, one frame per 1 / `fps` seconds of game time.
             :param upload: bool, optional
                 Enables automatic uploading to social media. If set to `True`, the game recording
                 will be uploaded automatically to social media platforms at the end of the game.
+            :param headless: bool, optional
+                Runs the game without a window or frame limiter, stepping the physics as fast as possible until
+                the game is finished. Nothing is drawn unless the game is recorded.
+            :param path: str, optional
+                Path to a game data file to load instead of looking up game number `n` in the level catalog. Either
+                a JSON game data file or a compact binary level (`BinaryLevel.EXTENSION`). The game number is then
+                the one of the file's level catalog entry, and a file that is not in the catalog keeps its recording
+                and upload out of the catalog.
+            :param replay: bool, optional
+                Records the position and velocity of every dynamic body after each physics step, and saves them as
+                a compact replay log in the `replays` folder at the end of the game, named after the level file.
+            :param audio: bool, optional
+                Plays the game sounds. Sounds are never played by headless games, but they are always logged, so
+                they can be mixed into offline renders. Without audio the mixer is not initialized at all.
+            :param profile: bool, optional
+                Times every phase of the game's launch and shutdown, and every stage of every frame (events, physics,
+                render, present, capture and tick). At the end of `run` the launch timings and the frame stage
+                percentiles and missed frame deadlines are printed as tables and saved as JSON in the `profiles`
+                folder.
+            :param profile_overlay: bool, optional
+                Profiles the frames and draws the recent mean duration of every frame stage on the screen (and so in
+                the recording as well).
+            :param max_steps: int, optional
+                Ends the game, unfinished, after this many physics steps. Defaults to no limit, or to
+                `MAX_HEADLESS_SECONDS` of game time for headless games, so a level that cannot be finished does not
+                run forever.
 
         Note:
             - Ensure proper setup for game recording and social media integration before enabling the respective flags.
             - Game recordings will be stored locally and managed within the project directory.
         """
         self._name = name
-        snake_name = self._name.lower().replace(' ', '_')
-        self._n = n if n != -1 else len(
-            [file for file in os.listdir(self.GAME_DATA_DIR) if file.startswith(snake_name)]) - 1
-        file = f"{snake_name}_data_{self._n}.json"
-        with open(os.path.join(self.GAME_DATA_DIR, file), "r") as f:
-            self._game_data = json.load(f)
+        self._profiler = StartupProfiler(enabled=profile)
+        with self._profiler.phase("level lookup"):
+            if path:
+                # The recording and upload of a level file are kept in its catalog entry, if it has one
+                self._catalog = LevelCatalog(data_dir=self.GAME_DATA_DIR) if recording else None
+                number = self._catalog.level_number(self._name, path) if self._catalog else None
+                if number is None: self._catalog = None
+                self._n = number if number is not None else n
+            else:
+                self._catalog = LevelCatalog(data_dir=self.GAME_DATA_DIR)
+                self._n = n if n != -1 else self._catalog.latest(self._name)
+                path = self._catalog.level_path(self._name, self._n)
+        # Names the replay, recording and profiles, so games of different level files never share them
+        self._level_name = os.path.splitext(os.path.basename(path))[0]
+        with self._profiler.phase("level load"):
+            if path.endswith(BinaryLevel.EXTENSION):
+                self._level = BinaryLevel.load(path)
+                self._game_data = self._level.settings
+            else:
+                self._level = None
+                with open(path, "r") as f:
+                    self._game_data = json.load(f)
 
         # Initialize pygame
-        pygame.init()
-        pygame.mixer.init()
+        self._headless = headless
+        self._video_driver = os.environ.get("SDL_VIDEODRIVER")  # Restored when pygame quits
+        if self._headless: os.environ["SDL_VIDEODRIVER"] = "dummy"
+        self._audio = audio and not headless
+        with self._profiler.phase("pygame init"):
+            if self._audio:
+                pygame.init()
+            else:
+                pygame.display.init()
+                pygame.font.init()
 
         # Screen dimensions and setup
-        self._screen = pygame.display.set_mode(self._game_data[self.SCREEN_STR][self.SIZE_STR])
-        self._screen_color = self._game_data[self.SCREEN_STR][self.COLOR_STR]
-        pygame.display.set_caption(f"{self._name} {self._n}")
+        with self._profiler.phase("display"):
+            self._screen = pygame.display.set_mode(self._game_data[self.SCREEN_STR][self.SIZE_STR])
+            self._screen_color = self._game_data[self.SCREEN_STR][self.COLOR_STR]
+            pygame.display.set_caption(f"{self._name} {self._n}")
 
         # Clock for controlling frame rate
         self._clock = pygame.time.Clock()
         self._fps = self._game_data[self.CLOCK_STR][self.FPS_STR]
+        self._profile_overlay = profile_overlay
+        self._frame_profiler = FrameProfiler(self._fps, enabled=profile or profile_overlay)
 
         # Pymunk space setup
         self._space = pymunk.Space()
         self._space.gravity = self._game_data[self.SPACE_STR][self.GRAVITY_STR]
         self._step = float(self._game_data[self.SPACE_STR][self.STEP_STR])
+        self._max_steps = max_steps if max_steps is not None or not headless else \
+            int(self.MAX_HEADLESS_SECONDS * self._step)
+        self._scene = Scene(self._space)
+        self._previous_positions = dict()
 
         self._draw_options = pymunk.pygame_util.DrawOptions(self._screen)
 
         self._logo_position = self._game_data[self.LOGO_STR][self.POSITION_STR]
+        self._replay = replay
         self._running = True
-        self._recorder = GameRecorder(self._name, self._n) if recording else None
-        self._uploader = ReelUploader(self._name, self._n,
-                                      players_color=self._get_players_color()) if recording and upload else None
-
-    def run(self):
+        self._finished = False
+        self._winner = None
+        self._collisions = 0
+        self._frames = 0
+        self._sound_events = []
+        with self._profiler.phase("recorder"):
+            self._recorder = GameRecorder(self._name, self._n if self._n != -1 else self._level_name, self._fps,
+                                          block=self._headless) if recording else None
+        with self._profiler.phase("uploader"):
+            self._uploader = ReelUploader(self._name, self._n if self._catalog else None,
+                                          players_color=self._get_players_color()) if recording and upload else None
+
+    def run(self) -> GameResult:
         """
         Run the game loop.
 
@@ -88,47 +170,163 @@ class GameBase(ABC):
             - Update the game state (e.g., positions, scores, events).
             - Render the game visuals on the screen.
             - Record the game if the `recording` flag is enabled.
-            - Upload the game recording to social media if the `upload` flag is enabled and the game has ended.
+            - Queue the game recording for upload to social media if the `upload` flag is enabled and the game
+              has ended.
 
         Notes:
-            - The game loop runs at a fixed frame rate to ensure smooth game play.
-            - If `recording` is enabled, the game recording starts when the game begins and stops when it ends.
-            - If `upload` is enabled, ensure the proper authentication setup for social media integration.
+            - The physics runs at a fixed timestep of 1 / `step` seconds, independent of the frame rate. Each frame
+              advances the simulation by the real time of the previous frame in whole steps (at most `MAX_SUBSTEPS`),
+              and the dynamic elements are drawn interpolated between the last two steps. `fps` only limits how often
+              frames are presented, so races play out identically on loaded and idle machines. A recorded (or
+              headless) frame advances the simulation by exactly 1 / `fps` seconds, with no `MAX_SUBSTEPS` cap, so
+              the video lasts as long as the race.
+            - If `recording` is enabled, the game recording starts when the game begins and stops when it ends. The
+              recording works with a headless display as well.
+            - If `upload` is enabled, the recording is added to the on-disk upload queue and `run` returns
+              immediately; run `python -m utils.media_uploaders.upload_queue` to upload queued recordings in the
+              background. Ensure the proper authentication setup for social media integration.
+            - If `replay` is enabled, the replay log is saved when the game ends and its path is returned.
+            - Static elements are drawn once to a cached background; each frame only redraws the dynamic elements
+              and updates the screen regions they covered.
+            - In headless mode the frame rate is not limited, and nothing is drawn unless the game is recorded.
+
+        :return GameResult: Whether the game was finished and by whom, the number of simulated physics steps, the
+            number of collisions and the elapsed time.
 
         Example:
             game = SomeGame(name="MyGame", recording=True, upload=True)
             game.run()
         """
-        self._screen.fill(self._screen_color)  # Clear the screen
-        if self._recorder: self._recorder.start()
+        render = not self._headless or self._recorder is not None
+        with self._profiler.phase("background"):
+            if render: self._render_background()
+        with self._profiler.phase("recorder start"):
+            if self._recorder: self._recorder.start(self._screen.get_size())
         events_handler = self._events_handler()
-        while self._running:
-            self._screen.fill(self._screen_color)  # Clear the screen
-            self._draw_logo()
-
-            self._running = not any(self._finish_game_handler())
-
+        dirty_rects = None
+        dt, accumulator, frame_time = 1 / self._step, 0.0, 0.0
+        # A recorded (or headless) frame always covers exactly 1 / fps seconds of game time, so its steps are never
+        # capped or dropped; otherwise the video would run longer than the race and out of sync with its sounds
+        fixed_frame_time = self._recorder is not None or self._headless
+        replay_log = ReplayLog(len(self._scene.dynamic_bodies), dt) if self._replay else None
+        if replay_log is not None: replay_log.record(self._scene.dynamic_bodies)
+        frame_profiler = self._frame_profiler
+        start_time = time.perf_counter()
+        while self._running and not self._finished and self._steps_left():
+            frame_profiler.start_frame()
             for event in pygame.event.get():
                 if event.type in events_handler:
                     events_handler[event.type]()
+            frame_profiler.lap("events")
+
+            if not render:
+                self._space.step(dt)
+                self._frames += 1
+                if replay_log is not None: replay_log.record(self._scene.dynamic_bodies)
+                frame_profiler.lap("physics")
+                frame_profiler.end_frame()
+                continue
+
+            # Step the physics simulation by the time the last frame took, in fixed steps
+            accumulator += frame_time
+            substeps = 0
+            while accumulator >= dt and (fixed_frame_time or substeps < self.MAX_SUBSTEPS) and not self._finished \
+                    and self._steps_left():
+                self._step_simulation(dt)
+                self._frames += 1
+                if replay_log is not None: replay_log.record(self._scene.dynamic_bodies)
+                substeps += 1
+                accumulator -= dt
+            # Too far behind the real time, let the simulation slow down
+            if not fixed_frame_time and accumulator >= dt: accumulator %= dt
+            frame_profiler.lap("physics")
+
+            # Draw the moving elements and update the display
+            rects = self._draw_frame(dirty_rects, alpha=accumulator / dt)
+            if self._profile_overlay: rects.append(frame_profiler.draw_overlay(self._screen))
+            frame_profiler.lap("render")
+            self._present(dirty_rects, rects)
+            dirty_rects = rects
+            frame_profiler.lap("present")
+            if self._recorder: self._recorder.capture(self._screen)
+            frame_profiler.lap("capture")
+
+            if not self._headless: frame_time = self._clock.tick(self._fps) / 1000.0  # Limit frame rate
+            if fixed_frame_time: frame_time = 1.0 / self._fps
+            frame_profiler.lap("tick")
+            frame_profiler.end_frame()
+
+        result = GameResult(finished=self._finished, winner=self._winner, frames=self._frames,
+                            collisions=self._collisions, elapsed=time.perf_counter() - start_time,
+                            sound_events=self._sound_events)
+        with self._profiler.phase("replay save"):
+            if replay_log is not None:
+                replay_log.events = self._sound_events
+                os.makedirs(REPLAY_DIR, exist_ok=True)
+                result.replay_path = os.path.join(REPLAY_DIR, f"{self._level_name}_replay.bin")
+                replay_log.save(result.replay_path)
 
-            # Step the physics simulation
-            self._space.step(1 / self._step)
+        # Quit the game
+        with self._profiler.phase("recorder stop"):
+            if self._recorder:
+                result.recording_path = self._recorder.stop()
+                if self._catalog and result.recording_path:
+                    self._catalog.set_recording(self._name, self._n, result.recording_path)
+        with self._profiler.phase("upload queue"):
+            if self._uploader and result.recording_path:
+                upload_id = self._uploader.queue(result.recording_path)
+                if self._catalog: self._catalog.set_upload(self._name, self._n, upload_id)
+        if not self._uploader and not self._headless:
+            time.sleep(1)
+        with self._profiler.phase("pygame quit"):
+            self._quit_pygame()
+
+        if self._profiler.enabled:
+            result.startup_profile = self._profiler.report()
+            self._profiler.save(os.path.join(PROFILE_DIR, f"{self._level_name}_startup.json"))
+            print(self._profiler.format_table())
+        if frame_profiler.enabled:
+            result.frame_profile = frame_profiler.stats()
+            frame_profiler.save(os.path.join(PROFILE_DIR, f"{self._level_name}_frames.json"))
+            print(frame_profiler.format_table())
+        return result
+
+    @property
+    def step_duration(self) -> float:
+        """
+        The duration of a physics step in seconds of game time.
+        """
+        return 1 / self._step
 
-            # Draw everything
-            self._space.debug_draw(self._draw_options)
+    def render_replay(self, replay_log: ReplayLog) -> GameResult:
+        """
+        Render a recorded game from its replay log, without simulating it.
 
-            # Update the display
-            pygame.display.flip()
-            self._clock.tick(self._fps)  # Limit frame rate to 60 FPS
+        The dynamic bodies are moved to the logged positions, interpolated at every 1 / `fps` seconds of game time,
+        and each frame is drawn and captured by the recorder as fast as possible. The game must have been created
+        with `recording` enabled.
 
-        # Quit the game
-        if self._recorder: self._recorder.stop()
-        if self._uploader:
-            self._uploader.upload()
-        else:
-            time.sleep(1)
-        pygame.quit()
+        :param replay_log: The replay log of a game of the same level.
+        :return GameResult: The number of logged physics steps, the number of logged hits, the elapsed time, the
+            logged sound events and the path of the recording.
+        """
+        start_time = time.perf_counter()
+        self._render_background()
+        self._recorder.start(self._screen.get_size())
+        bodies, dirty_rects = self._scene.dynamic_bodies, None
+        for frame in range(int((len(replay_log) - 1) * replay_log.dt * self._fps) + 1):
+            for body, position in zip(bodies, replay_log.positions_at(frame / self._fps)):
+                body.position = self._previous_positions[body] = tuple(position)
+            rects = self._draw_frame(dirty_rects)
+            self._present(dirty_rects, rects)
+            dirty_rects = rects
+            self._recorder.capture(self._screen)
+        result = GameResult(finished=True, winner=None, frames=len(replay_log) - 1,
+                            collisions=sum(sound == Sound.HIT.name for _, sound in replay_log.events),
+                            elapsed=time.perf_counter() - start_time, sound_events=replay_log.events,
+                            recording_path=self._recorder.stop())
+        self._quit_pygame()
+        return result
 
     def _get_players_color(self) -> list[tuple]:
         """
@@ -165,22 +363,120 @@ class GameBase(ABC):
             pygame.QUIT: self._quit_handler
         }
 
-    def _finish_game_handler(self) -> list[bool]:
+    def _finish_game(self, winner: Optional[tuple] = None):
+        """
+        Mark the game as finished. The game loop stops before the next frame.
+
+        Called by the game itself (e.g. from a collision callback) when its finishing condition is met.
+
+        :param winner: The color of the player who won the game, if any.
         """
-        Check conditions for finishing the game.
+        if self._finished: return
+        self._finished = True
+        self._winner = winner
 
-        :return list[bool]:
-            A list of boolean values, where each element represents whether
-            a specific condition for finishing the game is met. The game is considered
-            finished if all values in the list are True.
+    def _play_sound(self, sound: Sound):
         """
-        pass
+        Play a sound and log it with the current physics step, so it can be mixed into offline renders.
+        """
+        if len(self._sound_events) < self.MAX_SOUND_EVENTS: self._sound_events.append((self._frames, sound.name))
+        if self._audio: sound.play()
 
     def _quit_handler(self):
         self._running = False
 
-    def _draw_logo(self):
-        font = pygame.font.SysFont("Agency FB", 20)
-        text = font.render("@ grr.sim.games", True, Color.BLACK.value)
+    def _steps_left(self) -> bool:
+        return self._max_steps is None or self._frames < self._max_steps
+
+    def _quit_pygame(self):
+        """
+        Quit pygame, and restore the video driver the process used before a headless game replaced it.
+        """
+        fonts.clear_cache()
+        sounds.clear_cache()
+        pygame.quit()
+        if self._headless:
+            if self._video_driver is None:
+                os.environ.pop("SDL_VIDEODRIVER", None)
+            else:
+                os.environ["SDL_VIDEODRIVER"] = self._video_driver
+
+    def _render_background(self):
+        """
+        Render the screen color, the logo and every non-dynamic element once to an offscreen surface.
+
+        The background is blitted to the screen, and the dynamic shapes that are redrawn every frame are collected.
+        """
+        self._background = pygame.Surface(self._screen.get_size())
+        self._background.fill(self._screen_color)
+        self._draw_logo(self._background)
+        background_draw_options = pymunk.pygame_util.DrawOptions(self._background)
+        self._dynamic_shapes = []
+        for element in self._scene.elements:
+            if element.body.body_type == pymunk.Body.DYNAMIC:
+                self._dynamic_shapes.extend(element.shapes)
+                self._previous_positions[element.body] = element.body.position
+            else:
+                for shape in element.shapes: self._draw_shape(background_draw_options, shape)
+        self._screen.blit(self._background, (0, 0))
+
+    def _step_simulation(self, dt: float):
+        """
+        Advance the physics by one fixed step, keeping the previous positions of the dynamic bodies for interpolation.
+        """
+        for body in self._previous_positions: self._previous_positions[body] = body.position
+        self._space.step(dt)
+
+    def _draw_frame(self, dirty_rects: Optional[list[pygame.Rect]], alpha: float = 1.0) -> list[pygame.Rect]:
+        """
+        Draw the dynamic shapes over the cached background.
+
+        :param dirty_rects: The screen regions covered by the dynamic shapes in the previous frame, or `None` on the
+            first frame.
+        :param alpha: How far the presented frame is between the previous physics step (0) and the last one (1).
+        :return list[pygame.Rect]: The screen regions covered by the dynamic shapes in this frame.
+        """
+        for rect in dirty_rects or []: self._screen.blit(self._background, rect, rect)
+        rects = []
+        for shape in self._dynamic_shapes:
+            offset = (self._previous_positions[shape.body] - shape.body.position) * (1.0 - alpha)
+            self._draw_shape(self._draw_options, shape, offset)
+            bb = shape.cache_bb()
+            left, top = math.floor(bb.left + offset.x), math.floor(bb.bottom + offset.y)
+            right, bottom = math.ceil(bb.right + offset.x), math.ceil(bb.top + offset.y)
+            rects.append(pygame.Rect(left, top, right - left + 1, bottom - top + 1).inflate(4, 4))
+        return rects
+
+    @staticmethod
+    def _present(dirty_rects: Optional[list[pygame.Rect]], rects: list[pygame.Rect]):
+        """
+        Update the screen regions drawn in the previous frame and in this one, or the whole display on the first
+        frame (when `dirty_rects` is `None`).
+        """
+        if dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects + rects)
+
+    @staticmethod
+    def _draw_shape(draw_options: pymunk.pygame_util.DrawOptions, shape: pymunk.Shape,
+                    offset: pymunk.Vec2d = pymunk.Vec2d(0, 0)):
+        """
+        Draw a single shape the same way `pymunk.Space.debug_draw` does, optionally moved by `offset`.
+        """
+        body, fill_color = shape.body, draw_options.color_for_shape(shape)
+        outline_color = draw_options.shape_outline_color
+        if isinstance(shape, pymunk.Poly):
+            vertices = [body.local_to_world(v) + offset for v in shape.get_vertices()]
+            draw_options.draw_polygon(vertices, shape.radius, outline_color, fill_color)
+        elif isinstance(shape, pymunk.Segment):
+            draw_options.draw_fat_segment(body.local_to_world(shape.a) + offset, body.local_to_world(shape.b) + offset,
+                                          shape.radius, outline_color, fill_color)
+        elif isinstance(shape, pymunk.Circle):
+            draw_options.draw_circle(body.local_to_world(shape.offset) + offset, body.angle, shape.radius,
+                                     outline_color, fill_color)
+
+    def _draw_logo(self, surface: pygame.Surface):
+        text = fonts.render_text("@ grr.sim.games", Color.BLACK.value)
         text_rect = text.get_rect(center=self._logo_position)
-        self._screen.blit(text, text_rect)
+        surface.blit(text, text_rect)
@@ -0,0 +1,36 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class GameResult:
+    """
+    Outcome of a single game run.
+
+    Attributes:
+        :param finished (bool): Whether the game reached its end, as opposed to being quit by the user or stopped by
+            its step limit.
+        :param winner (tuple, optional): The color of the winning player, or `None` if the game was quit
+            before anyone won.
+        :param frames (int): The number of fixed physics steps simulated until the game ended.
+        :param collisions (int): The number of collisions between players and obstacles or other players.
+        :param elapsed (float): The wall-clock time of the game loop in seconds.
+        :param replay_path (str, optional): The path of the saved replay log, if the game was recorded for replay.
+        :param recording_path (str, optional): The path of the video recording, if the game was recorded and the
+            video file could be opened.
+        :param sound_events (list[tuple[int, str]]): The (physics step, sound name) of every sound played, up to
+            `GameBase.MAX_SOUND_EVENTS`.
+        :param startup_profile (dict, optional): The launch and shutdown phase timings, if the game was profiled.
+        :param frame_profile (dict, optional): The frame stage percentiles and missed deadlines, if the game was
+            profiled.
+    """
+    finished: bool
+    winner: Optional[tuple]
+    frames: int
+    collisions: int
+    elapsed: float
+    replay_path: Optional[str] = None
+    recording_path: Optional[str] = None
+    sound_events: list[tuple[int, str]] = field(default_factory=list)
+    startup_profile: Optional[dict] = None
+    frame_profile: Optional[dict] = None
@@ -1,17 +1,24 @@
-from elements.boundary import Boundary
+import numpy as np
+
 from elements.boundary_line import BoundaryLine
 from elements.brick import Brick
-from elements.element import Element
+from elements.collision_type import CollisionType
+from elements.compound_boundary import CompoundBoundary
 from elements.victory_line import VictoryLine
 from games.game_base import GameBase
+from utils.level_compiler.binary_level import BinaryLevel
+from utils.level_compiler.level_compiler import compile_boundaries, compile_boundaries_lines
 from utils.sounds import Sound
 
 
 class SquareRaceGame(GameBase):
     GAME_NAME = "Square Race Game"
     VICTORY_LINE_STR, BOUNDARIES_STR, BOUNDARIES_LINES_STR, BRICKS_STR = "victory_line", "boundaries", "boundaries_lines", "bricks"
+    VELOCITY_STR, GROUP_STR, RECTS_STR, A_CHR, B_CHR = "velocity", "group", "rects", "a", "b"
 
-    def __init__(self, n: int = -1, recording: bool = True, upload: bool = True):
+    def __init__(self, n: int = -1, recording: bool = True, upload: bool = True, headless: bool = False,
+                 path: str = None, replay: bool = False, audio: bool = True, profile: bool = False,
+                 profile_overlay: bool = False, max_steps: int = None):
         """
         Initialize a SquareRaceGame instance.
 
@@ -28,53 +35,175 @@ class SquareRaceGame(GameBase):
                 Whether to enable game recording. Defaults to True.
             :param upload (bool, optional):
                 Whether to enable automatic upload to social media after the game ends. Defaults to True.
+            :param headless (bool, optional):
+                Whether to simulate the game as fast as possible without a window. Defaults to False.
+            :param path (str, optional):
+                Path to a game data file or binary level to load instead of game number `n`.
+            :param replay (bool, optional):
+                Whether to save a replay log of the bricks' positions and velocities. Defaults to False.
+            :param audio (bool, optional):
+                Whether to play the game sounds. Headless games never play sounds. Defaults to True.
+            :param profile (bool, optional):
+                Whether to time the phases of the game's launch and shutdown and the stages of every frame.
+                Defaults to False.
+            :param profile_overlay (bool, optional):
+                Whether to draw the frame stage timings on the screen. Defaults to False.
+            :param max_steps (int, optional):
+                The number of physics steps after which the game ends unfinished. Defaults to no limit, or to
+                `MAX_HEADLESS_SECONDS` of game time for headless games.
         """
-        super().__init__(self.GAME_NAME, n, recording, upload)
-        self._victory_line = [VictoryLine(**victory_line_data) for victory_line_data in
-                              self._game_data[self.VICTORY_LINE_STR]]
-        self._boundaries = [Boundary(**boundary_data) for boundary_data in self._game_data[self.BOUNDARIES_STR]]
-        self._boundaries_lines = [BoundaryLine(**boundary_line_data) for boundary_line_data in
-                                  self._game_data[self.BOUNDARIES_LINES_STR]]
-        self._bricks = [Brick(**brick_data) for brick_data in self._game_data[self.BRICKS_STR]]
-        self._space.add(*Element.items)
-        self._add_victory_line_collision_handler()
-        self._add_brick_collision_handler()
+        super().__init__(self.GAME_NAME, n, recording, upload, headless, path, replay, audio, profile,
+                         profile_overlay, max_steps)
+        # JSON levels are compiled on load; binary levels are saved compiled, so the scene is built from their arrays
+        with self._profiler.phase("level compile"):
+            level = self._level or self.compile_level(self._game_data)
+        with self._profiler.phase("elements"):
+            self._build_elements(level)
+        with self._profiler.phase("scene"):
+            self._scene.add(*self._victory_line, *self._boundaries, *self._boundaries_lines, *self._bricks)
+        with self._profiler.phase("collision handlers"):
+            self._add_victory_line_collision_handler()
+            self._add_brick_collision_handler()
+
+    def _build_elements(self, level: BinaryLevel):
+        self._victory_line = [
+            VictoryLine(position=(x, y), size=(w, h), color=tuple(color), group=group) for (x, y, w, h), color, group
+            in zip(level["victory_line_rects"].tolist(), level["victory_line_colors"].tolist(),
+                   level["victory_line_groups"].tolist())
+        ]
+        rects = [((x, y), (w, h)) for x, y, w, h in level["boundaries_rects"].tolist()]
+        shapes = level["boundaries_shapes"].tolist()
+        self._boundaries = [
+            CompoundBoundary(rects=rects[start:end], color=tuple(color), group=group) for start, end, color, group
+            in zip(shapes, shapes[1:], level["boundaries_colors"].tolist(), level["boundaries_groups"].tolist())
+        ]
+        self._boundaries_lines = [
+            BoundaryLine(a=(ax, ay), b=(bx, by), group=group) for (ax, ay, bx, by), group
+            in zip(level["boundaries_lines_segments"].tolist(), level["boundaries_lines_groups"].tolist())
+        ]
+        self._bricks = [
+            Brick(position=(x, y), size=(w, h), velocity=tuple(velocity), color=tuple(color), group=group)
+            for (x, y, w, h), velocity, color, group
+            in zip(level["bricks_rects"].tolist(), level["bricks_velocities"].tolist(),
+                   level["bricks_colors"].tolist(), level["bricks_groups"].tolist())
+        ]
 
     def _get_players_color(self) -> list[tuple]:
+        if self._level: return self._level["bricks_colors"].tolist()
         return [brick_data[self.COLOR_STR] for brick_data in self._game_data[self.BRICKS_STR]]
 
-    def _finish_game_handler(self) -> list[bool]:
-        return [brick.body.velocity == (0, 0) for brick in self._bricks]
+    @classmethod
+    def compile_level(cls, game_data: dict) -> BinaryLevel:
+        """
+        Compile JSON game data into a binary level.
+
+        Adjacent boundary tiles are merged into a few shapes sharing one static body, and collinear boundary lines
+        are joined, without the parts along tile faces, so the physics cost follows the track outline rather than
+        the painted tiles.
+        The compiled boundaries are stored as the rectangles of all compound boundaries, `boundaries_shapes` holding
+        the index of the first rectangle of every compound boundary (and the total count last).
+        """
+        victory_line = game_data[cls.VICTORY_LINE_STR]
+        if isinstance(victory_line, dict):
+            raise ValueError("The level's victory line is in the old {a, b, group} form; regenerate the level or "
+                             "replace the victory line with its list of boxes")
+        boundaries = compile_boundaries(game_data[cls.BOUNDARIES_STR])
+        boundaries_lines = compile_boundaries_lines(game_data[cls.BOUNDARIES_LINES_STR], game_data[cls.BOUNDARIES_STR],
+                                                    game_data[cls.SCREEN_STR][cls.SIZE_STR])
+        bricks = game_data[cls.BRICKS_STR]
+
+        def rects(data: list) -> np.ndarray:
+            return np.array([(*position, *size) for position, size in data], dtype=np.float64).reshape(-1, 4)
+
+        def colors(data: list) -> np.ndarray:
+            return np.array([d[cls.COLOR_STR] for d in data], dtype=np.uint8).reshape(-1, 4)
+
+        def groups(data: list) -> np.ndarray:
+            return np.array([d[cls.GROUP_STR] for d in data], dtype=np.int32)
+
+        settings = {key: value for key, value in game_data.items()
+                    if key not in (cls.VICTORY_LINE_STR, cls.BOUNDARIES_STR, cls.BOUNDARIES_LINES_STR, cls.BRICKS_STR)}
+        return BinaryLevel(settings, {
+            "victory_line_rects": rects([(d[cls.POSITION_STR], d[cls.SIZE_STR]) for d in victory_line]),
+            "victory_line_colors": colors(victory_line),
+            "victory_line_groups": groups(victory_line),
+            "boundaries_rects": rects([rect for d in boundaries for rect in d[cls.RECTS_STR]]),
+            "boundaries_shapes": np.cumsum([0] + [len(d[cls.RECTS_STR]) for d in boundaries], dtype=np.int32),
+            "boundaries_colors": colors(boundaries),
+            "boundaries_groups": groups(boundaries),
+            "boundaries_lines_segments": rects([(d[cls.A_CHR], d[cls.B_CHR]) for d in boundaries_lines]),
+            "boundaries_lines_groups": groups(boundaries_lines),
+            "bricks_rects": rects([(d[cls.POSITION_STR], d[cls.SIZE_STR]) for d in bricks]),
+            "bricks_velocities": np.array([d[cls.VELOCITY_STR] for d in bricks], dtype=np.float64).reshape(-1, 2),
+            "bricks_colors": colors(bricks),
+            "bricks_groups": groups(bricks),
+        })
+
+    @classmethod
+    def export_level(cls, level: BinaryLevel) -> dict:
+        """
+        Export a binary level as JSON game data.
+
+        The exported boundaries are the compiled ones, so the level plays the same but its tiles are merged.
+        """
+        colors = {name: level[name].tolist() for name in
+                  ("victory_line_colors", "boundaries_colors", "bricks_colors")}
+        shapes = level["boundaries_shapes"].tolist()
+        boundaries_rects = level["boundaries_rects"].tolist()
+        return level.settings | {
+            cls.VICTORY_LINE_STR: [
+                {cls.POSITION_STR: [x, y], cls.SIZE_STR: [w, h], cls.COLOR_STR: color, cls.GROUP_STR: group}
+                for (x, y, w, h), color, group in zip(level["victory_line_rects"].tolist(),
+                                                      colors["victory_line_colors"],
+                                                      level["victory_line_groups"].tolist())
+            ],
+            cls.BOUNDARIES_STR: [
+                {cls.POSITION_STR: [x, y], cls.SIZE_STR: [w, h], cls.COLOR_STR: color, cls.GROUP_STR: group}
+                for start, end, color, group in zip(shapes, shapes[1:], colors["boundaries_colors"],
+                                                    level["boundaries_groups"].tolist())
+                for x, y, w, h in boundaries_rects[start:end]
+            ],
+            cls.BOUNDARIES_LINES_STR: [
+                {cls.A_CHR: [ax, ay], cls.B_CHR: [bx, by], cls.GROUP_STR: group}
+                for (ax, ay, bx, by), group in zip(level["boundaries_lines_segments"].tolist(),
+                                                   level["boundaries_lines_groups"].tolist())
+            ],
+            cls.BRICKS_STR: [
+                {cls.POSITION_STR: [x, y], cls.SIZE_STR: [w, h], cls.VELOCITY_STR: velocity, cls.COLOR_STR: color,
+                 cls.GROUP_STR: group}
+                for (x, y, w, h), velocity, color, group in zip(level["bricks_rects"].tolist(),
+                                                                level["bricks_velocities"].tolist(),
+                                                                colors["bricks_colors"],
+                                                                level["bricks_groups"].tolist())
+            ],
+        }
 
     def _stop_game(self):
         for body in self._space.bodies: body.velocity = (0, 0)
 
     def _add_victory_line_collision_handler(self):
+        bricks_colors = {brick.shape: tuple(brick.shape.color) for brick in self._bricks}
+
         def victory_line_collision_handler(arbiter, space, data):
-            Sound.WIN.value.play()
-            for body in space.bodies:
-                vx, vy = body.velocity
-                body.velocity = int(vx / 40.0), int(vy / 40.0)
+            if self._finished: return False
+            self._play_sound(Sound.WIN)
+            self._finish_game(winner=next(bricks_colors[shape] for shape in arbiter.shapes if shape in bricks_colors))
+            self._stop_game()
             return False
 
-        for brick in self._bricks:
-            for victory_line_element in self._victory_line:
-                handler = self._space.add_collision_handler(victory_line_element.shape.collision_type,
-                                                            brick.shape.collision_type)
-                handler.begin = victory_line_collision_handler
+        handler = self._space.add_collision_handler(CollisionType.VICTORY_LINE, CollisionType.BRICK)
+        handler.begin = victory_line_collision_handler
 
     def _add_brick_collision_handler(self):
 
         def brick_collision_handler(arbiter, space, data):
-            Sound.HIT.value.play()
+            self._collisions += 1
+            self._play_sound(Sound.HIT)
             return True
 
-        for brick in self._bricks:
-            for victory_line_element in self._victory_line:
-                for shape in self._space.shapes:
-                    if shape.collision_type == brick.shape.collision_type or shape.collision_type == victory_line_element.shape.collision_type: continue
-                    handler = self._space.add_collision_handler(brick.shape.collision_type, shape.collision_type)
-                    handler.begin = brick_collision_handler
+        for collision_type in (CollisionType.WALL, CollisionType.BRICK):
+            handler = self._space.add_collision_handler(CollisionType.BRICK, collision_type)
+            handler.begin = brick_collision_handler
 
 
 if __name__ == '__main__':
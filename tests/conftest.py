@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+# The games and the editor run on SDL's dummy drivers, so the tests need no display or audio device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+@pytest.fixture
+def sample_level() -> str:
+    from utils.level_catalog.level_catalog import GAMES_DATA_DIR
+
+    return os.path.join(GAMES_DATA_DIR, "square_race_game_data_9.json")
+
+
+@pytest.fixture
+def simulate():
+    """
+    Run a Square Race level headlessly and return its `GameResult` and replay log, deleting the replay file.
+    """
+    from games.square_race_game import SquareRaceGame
+    from utils.replay.replay_log import ReplayLog
+
+    def simulate(path: str, **kwargs):
+        result = SquareRaceGame(recording=False, upload=False, headless=True, path=path, replay=True, **kwargs).run()
+        replay_log = ReplayLog.load(result.replay_path)
+        os.remove(result.replay_path)
+        return result, replay_log
+
+    return simulate
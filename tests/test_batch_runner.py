@@ -0,0 +1,41 @@
+import os
+import time
+
+from games.batch_runner import BatchRunner
+from games.square_race_game import SquareRaceGame
+
+
+class StuckGame(SquareRaceGame):
+    def run(self):
+        while True: time.sleep(1)
+
+
+class CrashingGame(SquareRaceGame):
+    def run(self):
+        os._exit(3)
+
+
+def test_rows_follow_the_given_order(sample_level):
+    rows = BatchRunner(workers=2).run([sample_level, "missing.json", sample_level])
+    assert [row["file"] for row in rows] == ["square_race_game_data_9.json", "missing.json",
+                                             "square_race_game_data_9.json"]
+    assert rows[0] == rows[2] | {"elapsed": rows[0]["elapsed"]}
+    assert rows[0]["error"] is None and rows[0]["winner"] is not None
+    assert "FileNotFoundError" in rows[1]["error"]
+
+
+def test_step_limit(sample_level):
+    row, = BatchRunner(max_steps=10).run([sample_level])
+    assert row["frames"] == 10 and row["winner"] is None
+
+
+def test_timeout_is_counted_per_game(sample_level):
+    start = time.monotonic()
+    rows = BatchRunner(StuckGame, workers=2, timeout=1).run([sample_level] * 4)
+    assert all(row["error"] == "TimeoutError(1 s)" for row in rows)
+    assert time.monotonic() - start < 3.5  # Two rounds of two games, not one timeout after another
+
+
+def test_crashed_worker_gets_an_error_row(sample_level):
+    row, = BatchRunner(CrashingGame).run([sample_level])
+    assert row["error"] == "Worker exited with code 3"
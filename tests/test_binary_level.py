@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from utils.level_compiler.binary_level import BinaryLevel
+
+
+@pytest.fixture
+def level() -> BinaryLevel:
+    return BinaryLevel({"screen": {"size": [400, 600]}}, {
+        "rects": np.arange(12, dtype=np.float64).reshape(3, 4),
+        "groups": np.array([1, 2, 3], dtype=np.int32),  # 12 bytes, padded to the alignment
+        "colors": np.array([[1, 2, 3, 4]], dtype=np.uint8),
+        "empty": np.empty((0, 4), dtype=np.float64),
+        "last": np.array([7], dtype=np.int16),
+    })
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_load_round_trip(tmp_path, level, mmap):
+    path = str(tmp_path / f"level{BinaryLevel.EXTENSION}")
+    level.save(path)
+    loaded = BinaryLevel.load(path, mmap=mmap)
+    assert loaded.settings == level.settings
+    assert list(loaded.blocks) == list(level.blocks)
+    for name, block in level.blocks.items():
+        assert loaded[name].dtype == block.dtype
+        assert loaded[name].shape == block.shape
+        assert np.array_equal(loaded[name], block)
+
+
+def test_blocks_are_aligned(tmp_path, level):
+    path = tmp_path / f"level{BinaryLevel.EXTENSION}"
+    level.save(str(path))
+    loaded = BinaryLevel.load(str(path))
+    assert path.stat().st_size % 8 == 0
+    for block in loaded.blocks.values():
+        assert block.ctypes.data % 8 == 0 or block.size == 0
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_only_empty_blocks(tmp_path, mmap):
+    path = str(tmp_path / f"level{BinaryLevel.EXTENSION}")
+    BinaryLevel({}, {"empty": np.empty((0, 2), dtype=np.float64)}).save(path)
+    assert BinaryLevel.load(path, mmap=mmap)["empty"].shape == (0, 2)
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / f"level{BinaryLevel.EXTENSION}"
+    path.write_bytes(b"not a level at all")
+    with pytest.raises(ValueError):
+        BinaryLevel.load(str(path))
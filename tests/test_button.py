@@ -0,0 +1,27 @@
+import pygame
+
+from utils.games_generator.control_elements.button import Button
+
+
+class CountingFont:
+    def __init__(self):
+        self.font = pygame.font.Font(None, 20)
+        self.rendered = []
+
+    def render(self, text, antialias, color):
+        self.rendered.append(text)
+        return self.font.render(text, antialias, color)
+
+
+def test_value_is_rendered_with_the_font_only_when_it_changes():
+    pygame.display.init()
+    pygame.font.init()
+    try:
+        font = CountingFont()
+        button = Button(pygame.Surface((100, 100)), (0, 0), (50, 20), value=3, font=font)
+        for _ in range(3): button.draw()
+        button.set_value(value=4)
+        for _ in range(3): button.draw()
+        assert font.rendered == ["3", "4"]
+    finally:
+        pygame.quit()
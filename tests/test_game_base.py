@@ -0,0 +1,49 @@
+import os
+import shutil
+
+import pytest
+
+from games import game_base
+from games.square_race_game import SquareRaceGame
+from utils.level_catalog.level_catalog import LevelCatalog
+
+
+def test_headless_game_finishes(sample_level, simulate):
+    result, replay_log = simulate(sample_level)
+    assert result.finished and result.winner is not None
+    assert len(replay_log) == result.frames + 1
+
+
+def test_step_limit_ends_the_game_unfinished(sample_level, simulate):
+    result, replay_log = simulate(sample_level, max_steps=100)
+    assert not result.finished and result.winner is None
+    assert result.frames == 100 and len(replay_log) == 101
+
+
+def test_headless_game_restores_the_video_driver(monkeypatch, sample_level):
+    monkeypatch.delenv("SDL_VIDEODRIVER", raising=False)
+    SquareRaceGame(recording=False, upload=False, headless=True, path=sample_level, max_steps=1).run()
+    assert "SDL_VIDEODRIVER" not in os.environ
+
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch) -> LevelCatalog:
+    monkeypatch.setattr(game_base, "LevelCatalog", lambda data_dir: LevelCatalog(str(tmp_path / "catalog.sqlite"),
+                                                                               str(tmp_path)))
+    return LevelCatalog(str(tmp_path / "catalog.sqlite"), str(tmp_path))
+
+
+def test_path_loaded_game_takes_its_number_from_the_catalog(catalog, tmp_path, sample_level):
+    catalog.allocate(SquareRaceGame.GAME_NAME)  # So the level's number is not the default's
+    n, path = catalog.allocate(SquareRaceGame.GAME_NAME)
+    shutil.copy(sample_level, path)
+    catalog.register(SquareRaceGame.GAME_NAME, n, path)
+    game = SquareRaceGame(recording=True, upload=True, headless=True, path=path)
+    game._quit_pygame()
+    assert game._n == n == 1 and game._catalog is not None and game._uploader.game_number == n
+
+
+def test_path_loaded_game_outside_the_catalog_keeps_out_of_it(catalog, sample_level):
+    game = SquareRaceGame(recording=True, upload=True, headless=True, path=sample_level)
+    game._quit_pygame()
+    assert game._catalog is None and game._uploader.game_number is None
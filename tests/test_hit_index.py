@@ -0,0 +1,36 @@
+import pygame
+
+from utils.games_generator.hit_index import HitIndex
+
+
+def test_query_finds_the_items_under_the_point():
+    index = HitIndex(cell_size=50)
+    index.insert(pygame.Rect(0, 0, 120, 30), "wide")
+    index.insert(pygame.Rect(100, 0, 20, 20), "small")
+    assert index.query((10, 10)) == ["wide"]
+    assert index.query((110, 10)) == ["wide", "small"]
+    assert index.query((110, 25)) == ["wide"]
+    assert index.query((120, 10)) == []  # Right edges are outside, like pygame.Rect.collidepoint
+    assert index.query((500, 500)) == []
+
+
+def test_insert_replaces_the_item_rect():
+    index = HitIndex(cell_size=50)
+    index.insert(pygame.Rect(0, 0, 10, 10), "item")
+    index.insert(pygame.Rect(0, 0, 40, 40), "item")
+    assert index.query((30, 30)) == ["item"]
+
+
+def test_query_matches_collidepoint_for_fractional_and_negative_points():
+    index = HitIndex(cell_size=50)
+    rect = pygame.Rect(-60, -60, 100, 100)
+    index.insert(rect, "item")
+    for point in [(-0.5, -0.5), (-60, -60), (-60.5, 0), (39.9, 39.9), (40, 0), (0, -61)]:
+        assert (index.query(point) == ["item"]) == bool(rect.collidepoint(point)), point
+
+
+def test_clear():
+    index = HitIndex()
+    index.insert(pygame.Rect(0, 0, 10, 10), "item")
+    index.clear()
+    assert index.query((5, 5)) == []
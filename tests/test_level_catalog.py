@@ -0,0 +1,102 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from utils.level_catalog.level_catalog import LevelCatalog
+
+GAME = "Square Race Game"
+
+
+@pytest.fixture
+def catalog(tmp_path) -> LevelCatalog:
+    return LevelCatalog(str(tmp_path / "catalog.sqlite"), str(tmp_path))
+
+
+def _allocate(path: str, data_dir: str) -> list[int]:
+    catalog = LevelCatalog(path, data_dir)
+    return [catalog.allocate(GAME)[0] for _ in range(25)]
+
+
+def test_allocate_numbers_in_order(catalog, tmp_path):
+    assert catalog.allocate(GAME) == (0, os.path.join(str(tmp_path), "square_race_game_data_0.json"))
+    assert catalog.allocate(GAME)[0] == 1
+    assert catalog.allocate("Other Game")[0] == 0
+
+
+def test_allocated_levels_are_saved_once_registered(catalog):
+    n, path = catalog.allocate(GAME)
+    assert catalog.latest(GAME) is None
+    with pytest.raises(FileNotFoundError):
+        catalog.level_path(GAME, n)
+    catalog.register(GAME, n, path)
+    assert catalog.latest(GAME) == n
+    assert catalog.level_path(GAME) == path
+    assert catalog.levels(GAME) == [(n, path)]
+
+
+def test_allocate_is_unique_across_processes(tmp_path):
+    path = str(tmp_path / "catalog.sqlite")
+    LevelCatalog(path, str(tmp_path))
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        numbers = [n for numbers in executor.map(_allocate, [path] * 4, [str(tmp_path)] * 4) for n in numbers]
+    assert sorted(numbers) == list(range(100))
+
+
+def test_existing_level_files_are_imported(tmp_path):
+    for n in (2, 5):
+        (tmp_path / f"square_race_game_data_{n}.json").write_text(json.dumps({}))
+    catalog = LevelCatalog(str(tmp_path / "catalog.sqlite"), str(tmp_path))
+    assert [n for n, _ in catalog.levels(GAME)] == [2, 5]
+    assert catalog.allocate(GAME)[0] == 6
+
+
+def test_recording_and_upload(catalog):
+    n, path = catalog.allocate(GAME)
+    catalog.register(GAME, n, path)
+    catalog.set_recording(GAME, n, "video.mp4")
+    catalog.set_upload(GAME, n, 7)
+    assert catalog.recording_path(GAME, n) == "video.mp4"
+    assert catalog.upload_id(GAME, n) == 7
+
+
+def test_level_files_added_after_the_catalog_are_found(tmp_path):
+    path = str(tmp_path / "catalog.sqlite")
+    LevelCatalog(path, str(tmp_path))
+    (tmp_path / "square_race_game_data_3.json").write_text(json.dumps({}))
+    catalog = LevelCatalog(path, str(tmp_path))
+    assert catalog.level_path(GAME, 3) == str(tmp_path / "square_race_game_data_3.json")
+    assert catalog.allocate(GAME)[0] == 4
+
+
+def test_level_files_added_while_the_catalog_is_open_are_found(catalog, tmp_path):
+    n, path = catalog.allocate(GAME)
+    (tmp_path / "square_race_game_data_0.json").write_text(json.dumps({}))
+    assert catalog.latest(GAME) is None
+    assert catalog.level_path(GAME, n) == path
+    assert catalog.latest(GAME) == n
+
+
+def test_connections_are_closed(catalog, monkeypatch):
+    import sqlite3
+
+    connections = []
+    connect = sqlite3.connect
+    monkeypatch.setattr(sqlite3, "connect", lambda *args, **kwargs: connections.append(connect(*args, **kwargs))
+                        or connections[-1])
+    catalog.register(GAME, *catalog.allocate(GAME))
+    assert catalog.levels(GAME)
+    assert connections
+    for connection in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            connection.execute("SELECT 1")
+
+
+def test_level_number(catalog, tmp_path):
+    n, path = catalog.allocate(GAME)
+    assert catalog.level_number(GAME, path) is None
+    catalog.register(GAME, n, path)
+    assert catalog.level_number(GAME, path) == n
+    assert catalog.level_number(GAME, os.path.relpath(path)) == n
+    assert catalog.level_number("Other Game", path) is None
@@ -0,0 +1,65 @@
+from utils.level_compiler.level_compiler import merge_rects, compile_boundaries, compile_boundaries_lines
+
+
+def tile(column: int, row: int, step: int = 50) -> dict:
+    return {"position": (column * step + step / 2, row * step + step / 2), "size": (step, step), "group": 1,
+            "color": (0, 0, 255, 255)}
+
+
+def line(a: tuple, b: tuple) -> dict:
+    return {"a": a, "b": b, "group": 1}
+
+
+def test_merge_rects_merges_a_block_into_one_rect():
+    rects = [(x * 50, y * 50, 50, 50) for x in range(3) for y in range(2)]
+    assert merge_rects(rects) == [(0, 0, 150, 100)]
+
+
+def test_merge_rects_keeps_separate_blocks_apart():
+    rects = [(0, 0, 50, 50), (50, 0, 50, 50), (150, 0, 50, 50), (0, 50, 50, 50)]
+    merged = merge_rects(rects)
+    assert sorted(merged) == [(0, 0, 100, 50), (0, 50, 50, 50), (150, 0, 50, 50)]
+    assert sum(w * h for _, _, w, h in merged) == 4 * 50 * 50
+
+
+def test_compile_boundaries_groups_by_color_and_group():
+    boundaries = [tile(0, 0), tile(1, 0), tile(3, 0) | {"color": (255, 0, 0, 255)}]
+    compiled = compile_boundaries(boundaries)
+    assert [(d["color"], d["group"], d["rects"]) for d in compiled] == [
+        ((0, 0, 255, 255), 1, [((50.0, 25.0), (100, 50))]),
+        ((255, 0, 0, 255), 1, [((175.0, 25.0), (50, 50))]),
+    ]
+
+
+def test_compile_boundaries_lines_joins_collinear_lines():
+    lines = [line((0, 0), (50, 0)), line((50, 0), (100, 0)), line((150, 0), (100, 0))]
+    assert compile_boundaries_lines(lines, [], (200, 200)) == [line((0, 0), (150, 0))]
+
+
+def test_compile_boundaries_lines_keeps_groups_apart():
+    lines = [line((0, 0), (50, 0)), line((50, 0), (100, 0)) | {"group": 2}]
+    assert len(compile_boundaries_lines(lines, [], (200, 200))) == 2
+
+
+def test_compile_boundaries_lines_drops_the_parts_on_tile_faces():
+    # A tile at (1, 0) on the top screen edge: the edge under the tile and the tile's outline are its faces
+    boundaries = [tile(1, 0)]
+    lines = [line((x, 0), (x + 50, 0)) for x in range(0, 200, 50)] + [
+        line((50, 0), (50, 50)), line((100, 0), (100, 50)), line((50, 50), (100, 50))]
+    assert compile_boundaries_lines(lines, boundaries, (200, 200)) == [
+        line((0, 0), (50, 0)), line((100, 0), (200, 0))]
+
+
+def test_compile_boundaries_lines_count_follows_the_outline():
+    # A 4 x 4 block of painted tiles: one line per screen edge stretch, however many tile edges were painted
+    boundaries = [tile(x, y) for x in range(1, 5) for y in range(1, 5)]
+    lines = [line((0, 0), (300, 0)), line((0, 0), (0, 300)), line((300, 0), (300, 300)), line((0, 300), (300, 300))]
+    for i in range(1, 5):
+        lines += [line((50, i * 50), (50, (i + 1) * 50)), line((250, i * 50), (250, (i + 1) * 50)),
+                  line((i * 50, 50), ((i + 1) * 50, 50)), line((i * 50, 250), ((i + 1) * 50, 250))]
+    assert sorted(map(str, compile_boundaries_lines(lines, boundaries, (300, 300)))) == sorted(map(str, lines[:4]))
+
+
+def test_compile_boundaries_lines_drops_lines_off_screen_and_keeps_diagonals():
+    lines = [line((0, -10), (50, -10)), line((0, 0), (50, 50))]
+    assert compile_boundaries_lines(lines, [], (200, 200)) == [line((0, 0), (50, 50))]
@@ -0,0 +1,71 @@
+import json
+
+import numpy as np
+import pytest
+
+from utils.games_generator.procedural_square_race_generator import ProceduralSquareRaceGenerator
+from utils.level_catalog.level_catalog import LevelCatalog
+
+
+def test_distances_follow_free_paths():
+    occupied = np.array([
+        [False, False, False],
+        [True, True, False],
+        [False, False, False],
+    ])
+    distances = ProceduralSquareRaceGenerator._distances(occupied, (0, 0))
+    assert distances.tolist() == [
+        [0, 1, 2],
+        [-1, -1, 3],
+        [6, 5, 4],
+    ]
+
+
+def test_distances_mark_walled_off_tiles_unreachable():
+    occupied = np.zeros((3, 3), dtype=bool)
+    occupied[1, :] = True
+    distances = ProceduralSquareRaceGenerator._distances(occupied, (0, 0))
+    assert (distances[2] == -1).all()
+    assert distances[0].tolist() == [0, 1, 2]
+
+
+def test_generate_is_deterministic():
+    generator = ProceduralSquareRaceGenerator()
+    assert generator.generate(7) == generator.generate(7)
+    assert generator.generate(7) != generator.generate(8)
+    assert generator.generate(7)["seed"] == 7
+
+
+def test_generated_level_is_valid():
+    generator = ProceduralSquareRaceGenerator(density=0.3, n_bricks=3)
+    data = generator.generate(1)
+    step = generator.tile_step
+    boundaries = {tuple(b["position"]) for b in data["boundaries"]}
+    assert all(tuple(b["size"]) == (step, step) for b in data["boundaries"])
+    assert len(data["bricks"]) == 3 and len({tuple(b["color"]) for b in data["bricks"]}) == 3
+    assert tuple(data["bricks"][0]["position"]) not in boundaries
+    assert all(abs(np.hypot(*b["velocity"]) - 50) < 1e-9 for b in data["bricks"])
+    # A horizontal line of boxes across one free tile, in two checkered rows
+    xs = {b["position"][0] for b in data["victory_line"]}
+    ys = {b["position"][1] for b in data["victory_line"]}
+    assert len(ys) == 2 and max(xs) - min(xs) < step
+    tile = (min(xs) // step * step + step // 2, (min(ys) + max(ys)) // 2)
+    assert tile not in boundaries
+
+
+def test_generate_gives_up_on_full_maps():
+    assert ProceduralSquareRaceGenerator(density=1.0).generate(0) is None
+
+
+def test_tiles_must_fit_a_brick():
+    with pytest.raises(ValueError):
+        ProceduralSquareRaceGenerator(tile_step=10)
+
+
+def test_generate_many_saves_through_the_catalog(tmp_path):
+    catalog = LevelCatalog(str(tmp_path / "catalog.sqlite"), str(tmp_path))
+    levels = ProceduralSquareRaceGenerator().generate_many(3, seed=10, catalog=catalog)
+    assert [n for n, _ in levels] == [0, 1, 2]
+    assert catalog.levels(ProceduralSquareRaceGenerator.GAME_NAME) == levels
+    with open(levels[1][1]) as f:
+        assert json.load(f)["seed"] == 11
@@ -0,0 +1,59 @@
+import numpy as np
+import pymunk
+import pytest
+
+from utils.replay.replay_log import ReplayLog
+
+
+def make_log(steps: int = 50) -> ReplayLog:
+    rng = np.random.default_rng(0)
+    bodies = [pymunk.Body(1, 1) for _ in range(3)]
+    log = ReplayLog(len(bodies), 1 / 60)
+    for _ in range(steps):
+        for body in bodies:
+            body.position = tuple(rng.normal(0, 1e6, 2))
+            body.velocity = tuple(rng.normal(0, 1e3, 2))
+        log.record(bodies)
+    log.events = [(3, "HIT"), (49, "WIN")]
+    return log
+
+
+def test_save_load_round_trip_is_lossless(tmp_path):
+    log = make_log()
+    path = str(tmp_path / "replay.bin")
+    log.save(path)
+    loaded = ReplayLog.load(path)
+    assert loaded == log
+    assert loaded.states.tobytes() == log.states.tobytes()
+    assert loaded.events == log.events
+    assert loaded.dt == log.dt
+
+
+def test_empty_log_round_trip(tmp_path):
+    log = ReplayLog(2, 1 / 60)
+    path = str(tmp_path / "replay.bin")
+    log.save(path)
+    loaded = ReplayLog.load(path)
+    assert len(loaded) == 0 and loaded == log
+
+
+def test_positions_at_interpolates_between_steps():
+    log = make_log(3)
+    middle = log.positions_at(1.5 * log.dt)
+    assert np.allclose(middle, (log.positions[1] + log.positions[2]) / 2)
+    assert np.array_equal(log.positions_at(-1), log.positions[0])
+    assert np.array_equal(log.positions_at(10), log.positions[-1])
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "replay.bin"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        ReplayLog.load(str(path))
+
+
+def test_replays_are_deterministic(sample_level, simulate):
+    first, first_log = simulate(sample_level)
+    second, second_log = simulate(sample_level)
+    assert (first.winner, first.frames, first.collisions) == (second.winner, second.frames, second.collisions)
+    assert first_log == second_log
@@ -0,0 +1,29 @@
+import json
+
+import pytest
+
+from games.square_race_game import SquareRaceGame
+from utils.level_compiler.binary_level import BinaryLevel
+
+
+def test_binary_and_exported_levels_replay_identically(tmp_path, sample_level, simulate):
+    with open(sample_level) as f:
+        level = SquareRaceGame.compile_level(json.load(f))
+    binary_path = str(tmp_path / f"square_race_game_data_9{BinaryLevel.EXTENSION}")
+    level.save(binary_path)
+    exported_path = str(tmp_path / "square_race_game_data_exported.json")
+    with open(exported_path, "w") as f:
+        json.dump(SquareRaceGame.export_level(BinaryLevel.load(binary_path)), f)
+
+    _, json_log = simulate(sample_level)
+    _, binary_log = simulate(binary_path)
+    _, exported_log = simulate(exported_path)
+    assert json_log == binary_log == exported_log
+
+
+def test_old_victory_line_format_is_rejected(sample_level):
+    with open(sample_level) as f:
+        data = json.load(f)
+    data["victory_line"] = {"a": [254, 10], "b": [350, 10], "group": 2}
+    with pytest.raises(ValueError):
+        SquareRaceGame.compile_level(data)
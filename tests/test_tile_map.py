@@ -0,0 +1,45 @@
+import numpy as np
+
+from utils.games_generator import tile_map
+
+
+def normalized(lines: list) -> list:
+    return sorted(tuple(sorted(map(tuple, line))) for line in lines)
+
+
+def test_border_rects():
+    occupied = np.zeros((3, 2), dtype=bool)
+    occupied[2, 1] = occupied[0, 0] = True
+    assert tile_map.border_rects(occupied, 10) == [(0, 0, 10, 10), (20, 10, 10, 10)]
+
+
+def test_edges_of_a_single_tile_are_its_outline():
+    occupied = np.zeros((3, 3), dtype=bool)
+    occupied[1, 1] = True
+    assert normalized(tile_map.edges(occupied, 10)) == normalized([
+        [(10, 10), (10, 20)], [(20, 10), (20, 20)], [(10, 10), (20, 10)], [(10, 20), (20, 20)]])
+
+
+def test_edges_skip_the_shared_edges_of_adjacent_tiles():
+    occupied = np.zeros((3, 1), dtype=bool)
+    occupied[:2, 0] = True
+    edges = normalized(tile_map.edges(occupied, 10))
+    assert ((10, 0), (10, 10)) not in edges
+    assert len(edges) == 6
+
+
+def test_edges_of_tiles_on_the_grid_border():
+    occupied = np.ones((1, 1), dtype=bool)
+    assert len(tile_map.edges(occupied, 10)) == 4
+
+
+def test_edges_of_a_window_are_offset_to_the_map():
+    occupied = np.zeros((6, 6), dtype=bool)
+    occupied[4, 3] = True
+    window = tile_map.edges(occupied[3:6, 2:5], 10, 3, 2)
+    assert normalized(window) == normalized(tile_map.edges(occupied, 10))
+
+
+def test_border_lines_start_with_the_map_outline():
+    lines = tile_map.border_lines(np.zeros((2, 2), dtype=bool), 10, (20, 20))
+    assert lines == tile_map.outline((20, 20))
@@ -0,0 +1,34 @@
+from functools import lru_cache
+
+import pygame
+
+from utils.colors import Color
+
+DEFAULT_FONT = "Agency FB"
+
+
+@lru_cache(maxsize=None)
+def get_font(name: str = DEFAULT_FONT, size: int = 20) -> pygame.font.Font:
+    """
+    Get a system font, looking it up only the first time it is requested.
+    """
+    return pygame.font.SysFont(name, size)
+
+
+@lru_cache(maxsize=1024)
+def render_text(text: str, color: tuple[int, int, int, int] = Color.BLACK.value, name: str = DEFAULT_FONT,
+                size: int = 20) -> pygame.Surface:
+    """
+    Render anti-aliased text, reusing the surface rendered for the same text, color, font name and size.
+
+    The returned surface is shared between callers and must not be modified.
+    """
+    return get_font(name, size).render(text, True, color)
+
+
+def clear_cache():
+    """
+    Forget every cached font and text surface. Must be called before `pygame.quit()`, which invalidates them.
+    """
+    render_text.cache_clear()
+    get_font.cache_clear()
@@ -0,0 +1,85 @@
+import queue
+from typing import Optional
+
+import numpy as np
+import pygame
+
+
+class FrameRingBuffer:
+    """
+    A bounded ring of preallocated BGRA frame buffers shared by a producer (the game loop) and a consumer
+    (an encoder thread).
+
+    Free slots and filled slots are handed over through two queues, so no frame memory is allocated after
+    initialization and memory use is bounded by `capacity`, however long the game is.
+    """
+
+    def __init__(self, size: tuple[int, int], capacity: int = 32):
+        """
+        Initialize a FrameRingBuffer.
+
+        :param size (tuple[int, int]): The (width, height) of the frames.
+        :param capacity (int, optional): The number of preallocated frames. Defaults to 32.
+        """
+        w, h = size
+        self.capacity = capacity
+        self._frames = np.empty((capacity, h, w, 4), dtype=np.uint8)
+        self._free = queue.Queue()
+        self._filled = queue.Queue()
+        for i in range(capacity): self._free.put(i)
+
+    @property
+    def depth(self) -> int:
+        """
+        The number of filled frames waiting for the consumer.
+        """
+        return self._filled.qsize()
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[int]:
+        """
+        Take a free slot, waiting up to `timeout` seconds (forever if `None`).
+
+        :return int | None: The slot index, or `None` if no slot became free in time.
+        """
+        try:
+            return self._free.get(block=timeout != 0, timeout=timeout or None)
+        except queue.Empty:
+            return None
+
+    def write(self, slot: int, surface: pygame.Surface):
+        """
+        Copy the surface's pixels into the slot as BGRA.
+
+        32-bit surfaces in the usual XRGB layout are copied straight from a view of their pixels, other surfaces
+        are converted first.
+        """
+        frame = self._frames[slot]
+        if surface.get_bitsize() == 32 and surface.get_masks()[:3] == (0xFF0000, 0xFF00, 0xFF):
+            pixels = pygame.surfarray.pixels2d(surface)
+            np.copyto(frame.view(np.uint32)[:, :, 0], pixels.T)
+            del pixels  # Unlock the surface
+        else:
+            frame[:] = np.frombuffer(pygame.image.tobytes(surface, "BGRA"), dtype=np.uint8).reshape(frame.shape)
+
+    def push(self, slot: Optional[int]):
+        """
+        Hand a filled slot to the consumer. `None` tells the consumer that no more frames will come.
+        """
+        self._filled.put(slot)
+
+    def pop(self) -> Optional[int]:
+        """
+        Wait for the next filled slot.
+
+        :return int | None: The slot index, or `None` once the producer is done.
+        """
+        return self._filled.get()
+
+    def frame(self, slot: int) -> np.ndarray:
+        return self._frames[slot]
+
+    def release(self, slot: int):
+        """
+        Return a consumed slot to the free slots.
+        """
+        self._free.put(slot)
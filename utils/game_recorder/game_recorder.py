@@ -1,73 +1,134 @@
 import os
-import shutil
+import threading
 import time
+import warnings
+from datetime import datetime
+from typing import Optional, Union
 
-import pyautogui
+import numpy as np
+import pygame
 
-from utils.private_parms import USER_NAME_FOLDER
-
-_WAITING_TIME = 0.5
+from utils.game_recorder.frame_ring_buffer import FrameRingBuffer
 
 
 class GameRecorder:
     """
     Handles recording and saving of game recordings.
 
-    This class provides functionality to record game sessions, save them to a local directory,
-    and optionally manage them for upload or playback.
+    This class captures the game's frames directly from the pygame screen surface and encodes them to an MP4 file
+    with OpenCV, so recording needs no screen-capture tool and works with a headless (dummy) display.
+
+    Frames are copied into a bounded ring of preallocated buffers and encoded by a dedicated thread, so encoding
+    does not eat into the game loop's frame budget and memory use does not grow with the length of the game. An
+    error raised by the encoder thread is raised again by the next `capture` or by `stop`.
     """
 
-    _SAVED_DIR = r"C:\Users\{user_name}\Videos\Captures".format(user_name=USER_NAME_FOLDER)
-    _DIR = r"C:\ws\pygame_projects\utils\game_recorder\game_recordings"
+    DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_recordings")
+    _FOURCC = "mp4v"
+    _BUFFER_CAPACITY = 32
 
-    def __init__(self, game_name: str, game_number: int):
+    def __init__(self, game_name: str, game_number: Union[int, str], fps: float = 60, block: bool = False):
         """
         Initialize a GameRecorder instance.
 
         Args:
             :param game_name (str): The name of the game.
-            :param game_number (int): The unique game number associated with this recording session.
+            :param game_number (Union[int, str]): The unique game number associated with this recording session,
+                or the name of the level file of a game loaded from a path.
+            :param fps (float, optional): The frame rate of the recorded video. Defaults to 60.
+            :param block (bool, optional): When the encoder falls behind and the buffer is full, wait for it instead
+                of dropping frames that are not accepted within one frame period. Defaults to False.
         """
         self.game_name = f"{game_name} {game_number}"
-
-    def start(self):
+        self.fps = fps
+        self.block = block
+        self.path = None
+        self.stats = dict()
+        self._writer = None
+        self._buffer = None
+        self._encoder = None
+        self._error = None
+
+    def start(self, size: tuple[int, int]):
         """
         Start the game recording process.
 
-        This method initializes the recording mechanism.
-        """
+        This method opens the video file and starts the encoder thread. If OpenCV cannot open the video file (e.g.
+        the codec is unavailable), a warning is issued and nothing is recorded.
 
-        pyautogui.hotkey('win', 'alt', 'g')
-        time.sleep(_WAITING_TIME)
-        pyautogui.hotkey('win', 'alt', 'r')
+        :param size: The (width, height) of the captured frames.
+        """
+        import cv2  # Imported on first recording, so games that do not record skip loading OpenCV
+
+        os.makedirs(self.DIR, exist_ok=True)
+        self.path = os.path.join(self.DIR, f"{self.game_name} {datetime.now():%Y-%m-%d %H-%M-%S}.mp4")
+        self._writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*self._FOURCC), self.fps, tuple(size))
+        if not self._writer.isOpened():
+            warnings.warn(f"Cannot open {self.path} with the {self._FOURCC} codec; {self.game_name} is not recorded")
+            self._writer.release()
+            self._writer, self.path = None, None
+            return
+        self._buffer = FrameRingBuffer(size, self._BUFFER_CAPACITY)
+        self._error = None
+        self.stats = {"frames": 0, "late": 0, "dropped": 0, "max_queue_depth": 0}
+        self._encoder = threading.Thread(target=self._encode, args=(tuple(size),), daemon=True)
+        self._encoder.start()
         print(f"Start Recording - {self.game_name}")
-        time.sleep(_WAITING_TIME * 2)
 
-    def stop(self):
+    def capture(self, surface: pygame.Surface):
         """
-        Stop the game recording process.
+        Queue the current content of the surface as the next frame of the recording.
 
-        This method stops the recording, finalizes the saved file, and ensures all captured data
-        is properly written to disk. It cleans up any resources related to the recording process.
-
-        The recording will be saved to the designated directory using the initialized game name and number.
+        A frame is late if no buffer was free when it was captured. Unless `block` is set, a late frame is dropped
+        if no buffer becomes free within one frame period.
         """
+        if self._writer is None: return
+        if self._error is not None: raise self._error
+        self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self._buffer.depth)
+        slot = self._buffer.acquire(timeout=0)
+        if slot is None:
+            self.stats["late"] += 1
+            slot = self._buffer.acquire(timeout=None if self.block else 1.0 / self.fps)
+            if slot is None:
+                self.stats["dropped"] += 1
+                return
+            if self._error is not None: raise self._error
+        self._buffer.write(slot, surface)
+        self._buffer.push(slot)
+        self.stats["frames"] += 1
+
+    def stop(self) -> Optional[str]:
+        """
+        Stop the game recording process.
 
-        time.sleep(_WAITING_TIME * 2)
-        pyautogui.hotkey('win', 'alt', 'r')
-        time.sleep(_WAITING_TIME)
-        pyautogui.hotkey('win', 'alt', 'g')
-        print(f"Stop Recording = {self.game_name}")
-        self._move_file_to_target_dir()
-
-    def _move_file_to_target_dir(self):
-        files = [f for f in os.listdir(self._SAVED_DIR) if f.startswith(self.game_name) and f.endswith("mp4")]
+        This method waits for the encoder to write all queued frames and finalizes the video file.
 
-        if len(files) == 0:
-            print(f"Record of {self.game_name} Not Saved.")
-            return
+        :raises Exception: The error raised by the encoder thread, if any.
 
-        file = max(files)
-        saved_path = os.path.join(self._SAVED_DIR, file)
-        shutil.move(saved_path, self._DIR)
-        print(f"Record of {self.game_name} Saved.")
+        :return Optional[str]: The path of the saved recording, or `None` if nothing was recorded.
+        """
+        if self._writer is None: return None
+        start_time = time.perf_counter()
+        self._buffer.push(None)
+        self._encoder.join()
+        self._writer.release()
+        self._writer, self._buffer, self._encoder = None, None, None
+        if self._error is not None: raise self._error
+        self.stats["flush_time"] = round(time.perf_counter() - start_time, 3)
+        print(f"Record of {self.game_name} Saved. {self.stats}")
+        return self.path
+
+    def _encode(self, size: tuple[int, int]):
+        import cv2
+
+        w, h = size
+        bgr = np.empty((h, w, 3), dtype=np.uint8)
+        try:
+            while (slot := self._buffer.pop()) is not None:
+                cv2.cvtColor(self._buffer.frame(slot), cv2.COLOR_BGRA2BGR, dst=bgr)
+                self._buffer.release(slot)
+                self._writer.write(bgr)
+        except Exception as e:
+            self._error = e
+            # Nothing frees slots anymore, so hand out every slot to wake a producer waiting for one
+            for slot in range(self._buffer.capacity): self._buffer.release(slot)
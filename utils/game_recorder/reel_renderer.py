@@ -0,0 +1,104 @@
+import os
+import shutil
+import subprocess
+import wave
+from typing import Type
+
+import numpy as np
+
+from games.game_base import GameBase
+from games.square_race_game import SquareRaceGame
+from utils.replay.replay_log import ReplayLog
+from utils.sounds import Sound
+
+
+class ReelRenderer:
+    """
+    Produces the reel of a game offline, faster than real time.
+
+    The game is simulated headlessly (or rendered from a replay log) without a frame limiter, every frame is drawn
+    to the headless screen and encoded by the `GameRecorder`, and the sounds played during the game are mixed into
+    an audio track at their exact game time. The sounds are read from their WAV files, so no audio device is
+    needed. The finished MP4 is saved in the `game_recordings` folder.
+
+    Muxing the audio track into the video requires `ffmpeg` on the PATH. Without it, the audio track is saved as a
+    WAV file next to the silent video.
+    """
+
+    def __init__(self, game_class: Type[GameBase] = SquareRaceGame, n: int = -1, path: str = None,
+                 replay_path: str = None):
+        """
+        Initialize a ReelRenderer.
+
+        :param game_class (Type[GameBase]): The game to render. Defaults to `SquareRaceGame`.
+        :param n (int, optional): The game number. Defaults to -1, the last saved game.
+        :param path (str, optional): Path to a game data file to load instead of game number `n`.
+        :param replay_path (str, optional): Path to a replay log of the game. If given, the reel is rendered from the
+            log instead of simulating the game again.
+        """
+        self.game_class = game_class
+        self.n = n
+        self.path = path
+        self.replay_path = replay_path
+
+    def render(self) -> str:
+        """
+        Render the reel.
+
+        :return str: The path of the finished MP4.
+        """
+        game = self.game_class(n=self.n, recording=True, upload=False, headless=True, path=self.path)
+        samples = {sound.name: sound.read_samples() for sound in Sound}
+        if len({(rate, s.shape[1]) for rate, s in samples.values()}) != 1:
+            raise ValueError("All sounds must have the same sample rate and number of channels")
+        sounds = {name: s for name, (_, s) in samples.items()}
+        sample_rate, channels = next((rate, s.shape[1]) for rate, s in samples.values())
+        dt = game.step_duration
+        if self.replay_path:
+            replay_log = ReplayLog.load(self.replay_path)
+            dt = replay_log.dt
+            result = game.render_replay(replay_log)
+        else:
+            result = game.run()
+        if result.recording_path is None: raise RuntimeError("The game could not be recorded")
+
+        audio_path = os.path.splitext(result.recording_path)[0] + ".wav"
+        self._mix(result.sound_events, dt, result.frames * dt, sounds, sample_rate, channels, audio_path)
+        return self._mux(result.recording_path, audio_path)
+
+    @staticmethod
+    def _mix(events: list[tuple[int, str]], dt: float, duration: float, sounds: dict[str, np.ndarray],
+             sample_rate: int, channels: int, path: str):
+        """
+        Mix the sounds of the (physics step, sound name) events into a 16-bit WAV file.
+        """
+        track = np.zeros((int(duration * sample_rate) + 1, channels), dtype=np.int32)
+        for step, name in events:
+            start = int(step * dt * sample_rate)
+            samples = sounds[name][:max(len(track) - start, 0)]
+            track[start:start + len(samples)] += samples
+        with wave.open(path, "wb") as f:
+            f.setnchannels(channels)
+            f.setsampwidth(2)
+            f.setframerate(sample_rate)
+            f.writeframes(np.clip(track, -2 ** 15, 2 ** 15 - 1).astype(np.int16).tobytes())
+
+    @staticmethod
+    def _mux(video_path: str, audio_path: str) -> str:
+        """
+        Mux the audio track into the video, replacing the silent video.
+        """
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            print(f"ffmpeg not found, the audio track of {video_path} is saved to {audio_path}")
+            return video_path
+        muxed_path = os.path.splitext(video_path)[0] + ".muxed.mp4"
+        subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-i", video_path, "-i", audio_path, "-c:v", "copy",
+                        "-c:a", "aac", "-shortest", muxed_path], check=True)
+        os.replace(muxed_path, video_path)
+        os.remove(audio_path)
+        return video_path
+
+
+if __name__ == '__main__':
+    print(ReelRenderer(n=-1).render())
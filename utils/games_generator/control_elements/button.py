@@ -2,6 +2,7 @@ from typing import Any
 
 import pygame
 
+from utils import fonts
 from utils.colors import Color
 
 
@@ -41,16 +42,33 @@ class Button:
         self._screen = screen
         self._box = box
         self._font = font
+        self._text = None  # The (value text, surface) last rendered with `font`
 
     def draw(self):
-        if not self._font: self._font = pygame.font.SysFont("Agency FB", 18)
         pygame.draw.rect(self._screen, self.color.value, self.rect)
         if self._box: pygame.draw.rect(self._screen, Color.BLACK.value, self.rect, 1)
         if self.value is not None:
-            text = self._font.render(str(self.value), True, Color.BLACK.value)
+            text = self._render_value()
             text_rect = text.get_rect(center=self.rect.center)
             self._screen.blit(text, text_rect)
 
+    def _render_value(self) -> pygame.Surface:
+        """
+        The rendered value, rendered again only when the value changes.
+        """
+        value = str(self.value)
+        if not self._font: return fonts.render_text(value, Color.BLACK.value, size=18)
+        if self._text is None or self._text[0] != value:
+            self._text = (value, self._font.render(value, True, Color.BLACK.value))
+        return self._text[1]
+
+    @property
+    def hit_rect(self) -> pygame.Rect:
+        """
+        The region in which clicks can change the button.
+        """
+        return self.rect
+
     def click(self, mouse_position: tuple[float, float]) -> bool:
         return self.rect.collidepoint(mouse_position)
 
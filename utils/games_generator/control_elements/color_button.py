@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 
 from utils.colors import Color
 from utils.games_generator.control_elements.button import Button
@@ -80,15 +80,14 @@ class ColorButton(Button):
         :param mouse_position: The position of the mouse cursor, if relevant.
         :param value: The color to add or remove from the waiting queue.
         """
-        if mouse_position is None: return
-        for button in self.colors_buttons:
-            if button.rect.collidepoint(mouse_position):
-                if button not in self._waiting:
-                    button._box = True
-                    self._waiting.append(button)
-                else:
-                    self._waiting.remove(button)
-                    button._box = False
+        button = self._button_at(mouse_position)
+        if button is None: return
+        if button not in self._waiting:
+            button._box = True
+            self._waiting.append(button)
+        else:
+            self._waiting.remove(button)
+            button._box = False
 
     def get_value(self, mouse_position: tuple[float, float] = None) -> Any:
         """
@@ -99,10 +98,19 @@ class ColorButton(Button):
         :return: The selected color or the first color in the waiting queue if none was clicked.
         """
         if mouse_position is None: return self.colors_buttons[0].color
-        for button in self.colors_buttons:
-            if button.rect.collidepoint(mouse_position):
-                return button.color
-        return None
+        button = self._button_at(mouse_position)
+        return button.color if button else None
+
+    def _button_at(self, mouse_position: tuple[float, float]) -> Optional[Button]:
+        """
+        The color button under the mouse position, found from its index in the strip of equal-width buttons.
+        """
+        if mouse_position is None or not self.colors_buttons: return None
+        first = self.colors_buttons[0].rect
+        i = (int(mouse_position[0]) - first.x) // first.w
+        if not 0 <= i < len(self.colors_buttons): return None
+        button = self.colors_buttons[i]
+        return button if button.rect.collidepoint(mouse_position) else None
 
     def draw(self):
         super().draw()
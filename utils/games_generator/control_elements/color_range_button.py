@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 
 from utils.colors import Color
 from utils.games_generator.control_elements.button import Button
@@ -48,8 +48,16 @@ class ColorRangeButton(Button):
         :param mouse_position: The current position of the mouse as (x, y) coordinates.
         :return: The color that was clicked on or `None` if no specific click was detected.
         """
-        if mouse_position is None: return None
-        for button in self._colors_buttons:
-            if button.rect.collidepoint(mouse_position):
-                return button.color
-        return None
+        button = self._button_at(mouse_position)
+        return button.color if button else None
+
+    def _button_at(self, mouse_position: tuple[float, float]) -> Optional[Button]:
+        """
+        The color button under the mouse position, found from its index in the strip of equal-width buttons.
+        """
+        if mouse_position is None or not self._colors_buttons: return None
+        first = self._colors_buttons[0].rect
+        i = (int(mouse_position[0]) - first.x) // first.w
+        if not 0 <= i < len(self._colors_buttons): return None
+        button = self._colors_buttons[i]
+        return button if button.rect.collidepoint(mouse_position) else None
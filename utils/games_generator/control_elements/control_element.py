@@ -5,6 +5,7 @@ from utils.games_generator.control_elements.button import Button
 from utils.games_generator.control_elements.color_button import ColorButton
 from utils.games_generator.control_elements.range_button import RangeButton
 from utils.games_generator.control_elements.select_point_button import SelectPointButton
+from utils.games_generator.hit_index import HitIndex
 
 
 class ControlElement(Button):
@@ -17,6 +18,7 @@ class ControlElement(Button):
     """
     _ELEMENT_WIDTH = 100
     control_elements = dict()  # all the elements that created
+    hit_index = HitIndex()  # the element names by the region of their buttons
 
     def __init__(self, screen: Any, element: str, top_left: tuple[float, float], size: tuple[float, float],
                  color: Color = Color.WHITE, n_colors: int = None, area_top_left: tuple[float, float] = None,
@@ -64,6 +66,7 @@ class ControlElement(Button):
 
         self.element = Button(screen, (x, y), (self._ELEMENT_WIDTH, h), value=element)
         self.control_elements[element] = self.button
+        self.hit_index.insert(self.button.hit_rect, element)
 
     def draw(self):
         self.element.draw()
@@ -71,3 +74,11 @@ class ControlElement(Button):
 
     def set_value(self, mouse_position: tuple[float, float] = None, value: Color = None):
         self.button.set_value(mouse_position, value)
+
+    @classmethod
+    def buttons_at(cls, mouse_position: tuple[float, float]) -> list[Button]:
+        """
+        The buttons of the control elements that a click at the mouse position can change.
+        """
+        buttons = [cls.control_elements[element] for element in cls.hit_index.query(mouse_position)]
+        return [button for button in buttons if button.hit_rect.collidepoint(mouse_position)]
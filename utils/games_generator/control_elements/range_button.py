@@ -1,5 +1,7 @@
 from typing import Any
 
+import pygame
+
 from utils.colors import Color
 from utils.games_generator.control_elements.button import Button
 
@@ -68,6 +70,10 @@ class RangeButton(Button):
         if self._button_plus.rect.collidepoint(mouse_position):
             self.value = min(self.value + self._step, self._max_value)
 
+    @property
+    def hit_rect(self) -> pygame.Rect:
+        return self.rect.union(self._button_minus.rect).union(self._button_plus.rect)
+
     def click(self, mouse_position: tuple[float, float]) -> bool:
         return self._button_minus.rect.collidepoint(mouse_position) or self._button_plus.rect.collidepoint(
             mouse_position)
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Callable
 
 from utils.games_generator.control_elements.button import Button
 
@@ -59,16 +59,19 @@ class SelectPointButton(Button):
                 self._waiting.append(self)
 
     @classmethod
-    def set_waiting(cls, mouse_position: tuple[float, float]):
+    def set_waiting(cls, mouse_position: tuple[float, float],
+                    to_world: Callable[[tuple[float, float]], tuple[float, float]] = None):
         """
         Updates the first value in the waiting list to the mouse click position if it is within the defined clickable area.
 
         :param mouse_position: The mouse click position to check and potentially update.
+        :param to_world: Converts the screen position to the coordinates stored as the value, e.g. when the area
+            shows a panned or zoomed view of the level. Defaults to keeping the screen position.
         """
         for button in cls._waiting:
             if button.area.click(mouse_position):
                 cls._waiting.remove(button)
-                button.value = mouse_position
+                button.value = to_world(mouse_position) if to_world else mouse_position
                 button._box = False
 
     @classmethod
@@ -1,8 +1,11 @@
-from typing import Any
+import math
+from typing import Any, Optional
 
+import numpy as np
 import pygame
 
 from utils.colors import Color
+from utils.games_generator import tile_map
 from utils.games_generator.control_elements.button import Button
 
 
@@ -10,7 +13,16 @@ class TilesButton(Button):
     """
     TilesButton is responsible for creating and managing a grid of tiles on a button interface.
     It keeps track of both the boundaries and the areas of the individual tiles within the defined region.
+
+    The tiles cover a map (in level coordinates, starting at (0, 0)) that can be larger than the button, which shows
+    a panned and zoomed view of it. The boundary tiles are held in a 2D occupancy array (columns x rows), so toggling
+    a tile is O(1), and the border lines (the edges between boundary and free tiles, plus the map's outline) are
+    derived from it when needed. The tiles are drawn in chunks of `_CHUNK` x `_CHUNK` tiles, cached as surfaces at
+    the current zoom; only the visible chunks are kept, so memory follows the view rather than the map size.
     """
+    _CHUNK = 16
+    _MAX_ZOOM = 4.0
+    _MIN_GRID_PIXELS = 6  # Tiles smaller than this on screen are drawn without their outline
 
     def __init__(
             self,
@@ -19,83 +31,188 @@ class TilesButton(Button):
             size: tuple[float, float],
             step: int = 50,
             tile_color: Color = Color.GRAY,
-            border_color: Color = Color.BLUE
+            border_color: Color = Color.BLUE,
+            map_size: tuple[int, int] = None,
     ):
         """
         Initialize a TilesButton.
 
         :param screen (Any): The Pygame screen or rendering surface on which this button will be drawn.
         :param top_left (tuple[float, float]): The top-left corner coordinates of the area this button covers.
-        :param size (tuple[float, float]): The width and height (dimensions) of the entire tiles grid region.
+        :param size (tuple[float, float]): The width and height (dimensions) of the area this button covers.
         :param step (int): The size of each individual tile (distance between each tile's boundaries). Default is 50.
         :param tile_color (Color): The default color of each tile in the grid. Default is gray.
         :param border_color (Color): The color used for tile borders. Default is blue.
+        :param map_size (tuple[int, int], optional): The (width, height) of the tiled map. Defaults to `size`.
         """
         super().__init__(screen=screen, top_left=top_left, size=size)
         self.tile_color = tile_color
         self.border_color = border_color
         self._step = step
-        self.tiles = None
-        self.border = list()
-        self.border_lines = list()
-        self.reset_size(top_left, size)
+        self.map_size = None
+        self.occupied = None
+        self._columns, self._rows = 0, 0
+        self._view = (0.0, 0.0)  # The map position shown at the button's top-left corner
+        self._zoom = 1.0  # Screen pixels per map pixel
+        self._chunks = dict()
+        self._border_lines = None
+        self.resize_map(map_size or size)
 
     def draw(self):
-        for tile in self.tiles: tile.draw()
-        for line in self.border_lines: pygame.draw.line(self._screen, Color.BLACK.value, line[0], line[1], 4)
-
-    def reset_size(self, top_left: tuple[float, float], size: tuple[float, float]):
-        w, h = size
-        x0, y0 = top_left
-        self.tiles = [
-            Button(screen=self._screen, top_left=(x, y), size=(self._step, self._step), color=self.tile_color, box=True)
-            for x in range(int(x0), int(x0 + w), self._step) for y in range(int(y0), int(y0 + h), self._step)
-        ]
-        self.border = list()
-        self.border_lines = [
-            [(x0, y0), (x0 + w, y0)],
-            [(x0, y0), (x0, y0 + h)],
-            [(x0 + w, y0), (x0 + w, y0 + h)],
-            [(x0, y0 + h), (x0 + w, y0 + h)]
-        ]
+        clip = self._screen.get_clip()
+        self._screen.set_clip(self.rect)
+        pygame.draw.rect(self._screen, Color.WHITE.value, self.rect)
+
+        chunk_size = self._CHUNK * self._step
+        (x0, y0), (x1, y1) = self.to_world(self.rect.topleft), self.to_world(self.rect.bottomright)
+        visible = {
+            (cx, cy)
+            for cx in range(max(int(x0 // chunk_size), 0), min(int(x1 // chunk_size) + 1, self._chunk_count(0)))
+            for cy in range(max(int(y0 // chunk_size), 0), min(int(y1 // chunk_size) + 1, self._chunk_count(1)))
+        }
+        self._chunks = {chunk: surface for chunk, surface in self._chunks.items() if chunk in visible}
+        for cx, cy in visible:
+            if (cx, cy) not in self._chunks: self._chunks[cx, cy] = self._render_chunk(cx, cy)
+            self._screen.blit(self._chunks[cx, cy], self.to_screen((cx * chunk_size, cy * chunk_size)))
+
+        for a, b in self._visible_border_lines(x0, y0, x1, y1):
+            pygame.draw.line(self._screen, Color.BLACK.value, self.to_screen(a), self.to_screen(b), 4)
+        self._screen.set_clip(clip)
+
+    def resize_map(self, map_size: tuple[int, int]):
+        """
+        Resize the tiled map, keeping the boundary tiles that are still on it.
+        """
+        map_size = tuple(int(v) for v in map_size)
+        if map_size == self.map_size: return
+        w, h = map_size
+        occupied = np.zeros((math.ceil(w / self._step), math.ceil(h / self._step)), dtype=bool)
+        if self.occupied is not None:
+            columns, rows = min(self._columns, occupied.shape[0]), min(self._rows, occupied.shape[1])
+            occupied[:columns, :rows] = self.occupied[:columns, :rows]
+        self.map_size = map_size
+        self.occupied = occupied
+        self._columns, self._rows = occupied.shape
+        self._chunks.clear()
+        self._border_lines = None
+        self.zoom(1.0)  # Keep the zoom and view within the new map
+
+    @property
+    def border_rects(self) -> list[tuple[int, int, int, int]]:
+        """
+        The (left, top, width, height) of the boundary tiles, by column and row.
+        """
+        return tile_map.border_rects(self.occupied, self._step)
+
+    @property
+    def border_lines(self) -> list[list[tuple[float, float]]]:
+        """
+        The outline of the map followed by every tile edge between a boundary tile and a free tile (or the outside
+        of the grid), as [a, b] lines.
+        """
+        if self._border_lines is None:
+            self._border_lines = tile_map.border_lines(self.occupied, self._step, self.map_size)
+        return self._border_lines
 
     def reset_color(self, tile_color: Color = None, border_color: Color = None):
         if tile_color is None and border_color is None: return
         if border_color is not None: self.border_color = border_color
         if tile_color is not None: self.tile_color = tile_color
-        for tile in self.tiles:
-            if tile in self.border:
-                tile.color = self.border_color
-            else:
-                tile.color = self.tile_color
+        self._chunks.clear()
+
+    def to_world(self, position: tuple[float, float]) -> tuple[float, float]:
+        """
+        Convert a screen position to map coordinates.
+        """
+        return (self._view[0] + (position[0] - self.rect.x) / self._zoom,
+                self._view[1] + (position[1] - self.rect.y) / self._zoom)
+
+    def to_screen(self, position: tuple[float, float]) -> tuple[int, int]:
+        """
+        Convert map coordinates to a screen position.
+        """
+        return (self.rect.x + round(position[0] * self._zoom) - round(self._view[0] * self._zoom),
+                self.rect.y + round(position[1] * self._zoom) - round(self._view[1] * self._zoom))
+
+    def pan(self, dx: float, dy: float):
+        """
+        Move the view by (dx, dy) screen pixels, within the map.
+        """
+        self._set_view(self._view[0] + dx / self._zoom, self._view[1] + dy / self._zoom)
+
+    def zoom(self, factor: float, anchor: tuple[float, float] = None):
+        """
+        Zoom the view by `factor`, keeping the map position under `anchor` (a screen position) in place.
+
+        The view can be zoomed out until the whole map fits the button, and in up to `_MAX_ZOOM`.
+        """
+        anchor = anchor or self.rect.center
+        world = self.to_world(anchor)
+        min_zoom = min(1.0, self.rect.w / self.map_size[0], self.rect.h / self.map_size[1])
+        zoom = min(max(self._zoom * factor, min_zoom), self._MAX_ZOOM)
+        if zoom != self._zoom: self._chunks.clear()
+        self._zoom = zoom
+        self._set_view(world[0] - (anchor[0] - self.rect.x) / zoom, world[1] - (anchor[1] - self.rect.y) / zoom)
+
+    def tile_at(self, mouse_position: tuple[float, float]) -> Optional[tuple[int, int]]:
+        """
+        The (column, row) of the tile under the mouse position, found from the map coordinates.
+        """
+        if mouse_position is None or not self.rect.collidepoint(mouse_position): return None
+        x, y = self.to_world(mouse_position)
+        column, row = int(x // self._step), int(y // self._step)
+        if not (0 <= column < self._columns and 0 <= row < self._rows): return None
+        return column, row
 
     def set_value(self, mouse_position: tuple[float, float] = None, value: Any = None):
         """
         Updates the tile boundaries or grid properties based on mouse interaction or specified value.
 
-        If the mouse_position is provided and is within the clickable area, the tile boundaries are updated accordingly.
-        Alternatively.
+        If the mouse_position is provided and is within the clickable area, the clicked tile is toggled between a
+        boundary tile and a free tile.
 
         :param mouse_position: The current mouse cursor position for interactive adjustments.
         :param value: A specific value used to redefine or adjust the tile boundaries.
         """
-        for tile in self.tiles:
-            if tile.click(mouse_position):
-                if tile in self.border:
-                    self.border.remove(tile)
-                    tile.color = self.tile_color
-                else:
-                    self.border.append(tile)
-                    tile.color = self.border_color
-                x0, y0 = tile.rect.topleft
-                w, h = tile.rect.size
-                for line in [
-                    [(x0, y0), (x0, y0 + h)],
-                    [(x0, y0), (x0 + w, y0)],
-                    [(x0 + w, y0), (x0 + w, y0 + h)],
-                    [(x0, y0 + h), (x0 + w, y0 + h)]
-                ]:
-                    if line in self.border_lines:
-                        self.border_lines.remove(line)
-                    else:
-                        self.border_lines.append(line)
+        tile = self.tile_at(mouse_position)
+        if tile is None: return
+        column, row = tile
+        self.occupied[column, row] = not self.occupied[column, row]
+        self._chunks.pop((column // self._CHUNK, row // self._CHUNK), None)
+        self._border_lines = None
+
+    def _set_view(self, x: float, y: float):
+        w, h = self.rect.w / self._zoom, self.rect.h / self._zoom
+        self._view = (min(max(x, 0.0), max(self.map_size[0] - w, 0.0)),
+                      min(max(y, 0.0), max(self.map_size[1] - h, 0.0)))
+
+    def _chunk_count(self, axis: int) -> int:
+        return math.ceil(self.occupied.shape[axis] / self._CHUNK)
+
+    def _render_chunk(self, cx: int, cy: int) -> pygame.Surface:
+        """
+        Render the tiles of a chunk at the current zoom.
+        """
+        cells = self.occupied[cx * self._CHUNK:(cx + 1) * self._CHUNK, cy * self._CHUNK:(cy + 1) * self._CHUNK]
+        colors = np.where(cells[:, :, None], np.array(self.border_color.value[:3], dtype=np.uint8),
+                          np.array(self.tile_color.value[:3], dtype=np.uint8))
+        chunk_size = self._CHUNK * self._step
+        left, top = cx * chunk_size, cy * chunk_size
+        edges_x = [round((left + i * self._step) * self._zoom) for i in range(cells.shape[0] + 1)]
+        edges_y = [round((top + j * self._step) * self._zoom) for j in range(cells.shape[1] + 1)]
+        size = (edges_x[-1] - edges_x[0], edges_y[-1] - edges_y[0])
+        surface = pygame.transform.scale(pygame.surfarray.make_surface(colors), size)
+        if self._step * self._zoom >= self._MIN_GRID_PIXELS:
+            for x in edges_x[:-1]:
+                pygame.draw.line(surface, Color.BLACK.value, (x - edges_x[0], 0), (x - edges_x[0], size[1]))
+            for y in edges_y[:-1]:
+                pygame.draw.line(surface, Color.BLACK.value, (0, y - edges_y[0]), (size[0], y - edges_y[0]))
+        return surface
+
+    def _visible_border_lines(self, x0: float, y0: float, x1: float, y1: float) -> list[list[tuple[float, float]]]:
+        """
+        The border lines around the visible tiles, computed from the visible part of the occupancy array.
+        """
+        c0, r0 = max(int(x0 // self._step) - 1, 0), max(int(y0 // self._step) - 1, 0)
+        c1, r1 = min(int(x1 // self._step) + 2, self._columns), min(int(y1 // self._step) + 2, self._rows)
+        return tile_map.outline(self.map_size) + tile_map.edges(self.occupied[c0:c1, r0:r1], self._step, c0, r0)
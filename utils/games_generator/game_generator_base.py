@@ -1,17 +1,18 @@
 import json
-import os
+import random
 
 import pygame
 
+from utils import fonts, sounds
 from utils.colors import Color
 from utils.games_generator.control_elements.button import Button
 from utils.games_generator.control_elements.color_range_button import ColorRangeButton
 from utils.games_generator.control_elements.control_element import ControlElement
-from utils.private_parms import ACCOUNT_USER_NAME
+from utils.level_catalog.level_catalog import LevelCatalog, GAMES_DATA_DIR
 
 
 class GameGeneratorBase:
-    DIR = r"C:\ws\pygame_projects\utils\games_data"
+    DIR = GAMES_DATA_DIR
 
     _COLOR_STR = "color"
     _POSITION_STR = "position"
@@ -19,6 +20,7 @@ class GameGeneratorBase:
     _WIDTH_STR = "width"
     _HEIGHT_STR = "height"
     _FPS_STR = "fps"
+    _SEED_STR = "seed"
 
     _GROUP_STR = "group"
     _GRAVITY_STR = "gravity"
@@ -45,8 +47,24 @@ class GameGeneratorBase:
     _CONTROL_HEIGHT = 100
     _CONTROL_WIDTH = 200
 
-    def __init__(self, game_name: str):
+    _MAX_SCREEN_WIDTH = 4000
+    _MAX_SCREEN_HEIGHT = 8000
+
+    # Events that can change the editor or need it repainted
+    _REDRAW_EVENTS = [pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.MOUSEWHEEL, pygame.KEYDOWN, pygame.WINDOWEXPOSED,
+                      pygame.VIDEOEXPOSE]
+
+    def __init__(self, game_name: str, seed: int = None):
+        """
+        Initialize a game generator.
+
+        :param game_name (str): The name of the generated game.
+        :param seed (int, optional): Seed of the generator's random choices (e.g. initial velocities). A random seed
+            is drawn if not given. The seed is saved in the game data, so the level can be reproduced.
+        """
         self.game_name = game_name
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self._random = random.Random(self.seed)
 
         self.screen = None
         self.width, self.height = 400, 600
@@ -67,23 +85,52 @@ class GameGeneratorBase:
         self._control_elements = self._get_control_elements()
         self._buttons = self._get_buttons()
         print(self._buttons)
+
+        # The editor only changes on input, so it sleeps until the next event and redraws once per batch of events
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(self._REDRAW_EVENTS)
+        self._draw()
+        pygame.display.flip()
         while self._running:
-            self._draw()
-            # Handle events
-            for event in pygame.event.get():
+            for event in [pygame.event.wait(), *pygame.event.get()]:
                 if event.type == pygame.QUIT:
                     self._running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    mouse_pos = pygame.mouse.get_pos()
-                    self._mouse_button_down_handler(mouse_pos)
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button <= 3:  # Wheel buttons zoom instead
+                    self._mouse_button_down_handler(event.pos)
+                elif event.type == pygame.MOUSEWHEEL:
+                    self._mouse_wheel_handler(pygame.mouse.get_pos(), event.y)
+                elif event.type == pygame.KEYDOWN:
+                    self._key_down_handler(event.key)
+            if not self._running: break
+            self._draw()
             pygame.display.flip()
 
         self._save_data()
+        fonts.clear_cache()
+        sounds.clear_cache()
         pygame.quit()
 
     def _mouse_button_down_handler(self, mouse_position: tuple[float, float]):
         pass
 
+    def _mouse_wheel_handler(self, mouse_position: tuple[float, float], y: int):
+        pass
+
+    def _key_down_handler(self, key: int):
+        pass
+
+    def _to_world(self, position: tuple[float, float]) -> tuple[float, float]:
+        """
+        Convert a screen position in the level area to level coordinates.
+        """
+        return position
+
+    def _to_screen(self, position: tuple[float, float]) -> tuple[float, float]:
+        """
+        Convert level coordinates to a screen position in the level area.
+        """
+        return position
+
     def _add_data(self):
         screen_size = ControlElement.control_elements[self._SCREEN_WIDTH_ELEMENT].value, \
                       ControlElement.control_elements[self._SCREEN_HEIGHT_ELEMENT].value
@@ -94,21 +141,40 @@ class GameGeneratorBase:
         space_step = ControlElement.control_elements[self._SPACE_STEP_ELEMENT].value
         logo_position = ControlElement.control_elements[self._LOGO_POSITION_ELEMENT].value
 
-        self.data |= {
-            self._SCREEN_ELEMENT: {self._SIZE_STR: screen_size, self._COLOR_STR: screen_color},
-            self._CLOCK_ELEMENT: {self._FPS_STR: clock_fps},
-            self._SPACE_ELEMENT: {self._GRAVITY_STR: space_gravity, self._STEP_STR: space_step},
-            self._LOGO_ELEMENT: {self._POSITION_STR: logo_position},
+        self.data |= self.settings_data(self.seed, screen_size, screen_color, clock_fps, space_gravity, space_step,
+                                        logo_position)
+
+    @classmethod
+    def settings_data(
+            cls,
+            seed: int,
+            screen_size: tuple[int, int],
+            screen_color: tuple,
+            clock_fps: int,
+            space_gravity: tuple[float, float],
+            space_step: int,
+            logo_position: tuple[float, float],
+    ) -> dict:
+        """
+        The game data shared by all games: the seed and the screen, clock, space and logo settings.
+        """
+        return {
+            cls._SEED_STR: seed,
+            cls._SCREEN_ELEMENT: {cls._SIZE_STR: screen_size, cls._COLOR_STR: screen_color},
+            cls._CLOCK_ELEMENT: {cls._FPS_STR: clock_fps},
+            cls._SPACE_ELEMENT: {cls._GRAVITY_STR: space_gravity, cls._STEP_STR: space_step},
+            cls._LOGO_ELEMENT: {cls._POSITION_STR: logo_position},
         }
 
     def _save_data(self):
         self._add_data()
-        snack_name = self.game_name.lower().replace(' ', '_')
-        n = len([f for f in os.listdir(self.DIR) if f.startswith(snack_name)])
-        file = f"{snack_name}_game_data_{n}.json"
-        with open(os.path.join(self.DIR, file), "w") as f:
+        catalog = LevelCatalog(data_dir=self.DIR)
+        game_name = f"{self.game_name} Game"
+        n, path = catalog.allocate(game_name)
+        with open(path, "w") as f:
             json.dump(self.data, f, indent=4)
-        print(f"{self.game_name} Game data saved successfully!")
+        catalog.register(game_name, n, path)
+        print(f"{game_name} {n} data saved successfully!")
 
     def _draw(self):
         logo_position_button = ControlElement.control_elements[self._LOGO_POSITION_ELEMENT]
@@ -119,10 +185,13 @@ class GameGeneratorBase:
         for b in self._buttons.values(): b.draw()
 
         if logo_position_button.value is not None:
-            font = pygame.font.SysFont("Agency FB", 20)
-            text = font.render(f"@ {ACCOUNT_USER_NAME}", True, Color.BLACK.value)
-            text_rect = text.get_rect(center=logo_position_button.value)
+            from utils.private_parms import ACCOUNT_USER_NAME  # Only the editor's logo needs the account
+
+            text = fonts.render_text(f"@ {ACCOUNT_USER_NAME}", Color.BLACK.value)
+            text_rect = text.get_rect(center=self._to_screen(logo_position_button.value))
+            self.screen.set_clip(pygame.Rect(0, 0, self.width, self.height))
             self.screen.blit(text, text_rect)
+            self.screen.set_clip(None)
 
     def _get_control_elements(self) -> list[ControlElement]:
         x, y = self._control_x, self._control_y
@@ -130,10 +199,10 @@ class GameGeneratorBase:
         self._control_idx = 8
         return [
             Button(self.screen, (self.width, 0), (self._CONTROL_WIDTH, self.height), color=Color.WHITE),
-            ControlElement(self.screen, self._SCREEN_WIDTH_ELEMENT, (x, y), (w, h), value=400, value_range=(400, 400),
-                           step=50),
+            ControlElement(self.screen, self._SCREEN_WIDTH_ELEMENT, (x, y), (w, h), value=400,
+                           value_range=(400, self._MAX_SCREEN_WIDTH), step=50),
             ControlElement(self.screen, self._SCREEN_HEIGHT_ELEMENT, (x, y + h), (w, h), value=600,
-                           value_range=(600, 600), step=50),
+                           value_range=(600, self._MAX_SCREEN_HEIGHT), step=50),
             ControlElement(self.screen, self._SCREEN_COLOR_ELEMENT, (x, y + 2 * h), (w, h), color=Color.GRAY,
                            n_colors=1),
             ControlElement(self.screen, self._CLOCK_FPS_ELEMENT, (x, y + 3 * h), (w, h), value=60,
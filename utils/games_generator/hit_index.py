@@ -0,0 +1,43 @@
+from typing import Any, Hashable
+
+import pygame
+
+
+class HitIndex:
+    """
+    Uniform grid index of rectangles for hit-testing mouse clicks.
+
+    Every rectangle is registered in the grid cells it overlaps, so finding the items under a point only checks the
+    few items of a single cell, however many items are indexed.
+    """
+
+    def __init__(self, cell_size: int = 50):
+        """
+        Initialize an empty HitIndex.
+
+        :param cell_size (int, optional): The width and height of a grid cell. Defaults to 50.
+        """
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], dict[Hashable, pygame.Rect]] = dict()
+
+    def insert(self, rect: pygame.Rect, item: Hashable):
+        """
+        Index the item by its rectangle, replacing the item's previous rectangle in the cells it overlaps.
+        """
+        for cell in self._cells_of(rect):
+            self._cells.setdefault(cell, dict())[item] = pygame.Rect(rect)
+
+    def query(self, point: tuple[float, float]) -> list[Any]:
+        """
+        The items whose rectangle contains the point, in the order they were first indexed.
+        """
+        cell = self._cells.get((int(point[0]) // self.cell_size, int(point[1]) // self.cell_size), dict())
+        return [item for item, rect in cell.items() if rect.collidepoint(point)]
+
+    def clear(self):
+        self._cells.clear()
+
+    def _cells_of(self, rect: pygame.Rect):
+        for cx in range(rect.left // self.cell_size, (rect.right - 1) // self.cell_size + 1):
+            for cy in range(rect.top // self.cell_size, (rect.bottom - 1) // self.cell_size + 1):
+                yield cx, cy
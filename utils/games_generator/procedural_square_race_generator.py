@@ -0,0 +1,199 @@
+import argparse
+import json
+import time
+from typing import Optional
+
+import numpy as np
+
+from utils.colors import Color
+from utils.games_generator import tile_map
+from utils.games_generator.square_race_game_generator import SquareRaceGameGenerator
+from utils.level_catalog.level_catalog import LevelCatalog
+
+
+class ProceduralSquareRaceGenerator:
+    """
+    Generates Square Race levels from parameters and a seed, without the interactive editor.
+
+    The boundary tiles are drawn at random on a (columns, rows) occupancy array, the bricks start at the center of a
+    free tile and the victory line crosses a free tile reachable from the start, at least `min_distance` of the
+    longest path away. Reachability is a breadth-first search over the whole array at once, one array step per tile
+    of distance. The level data has the same shape as the interactive generator's, and the same seed and
+    parameters always give the same level.
+    """
+    GAME_NAME = f"{SquareRaceGameGenerator._GAME_NAME} Game"
+    _MAX_ATTEMPTS = 100
+    # Colors the bricks are never given: the victory line's
+    _RESERVED_COLORS = (Color.BLACK, Color.WHITE)
+
+    def __init__(
+            self,
+            screen_size: tuple[int, int] = (400, 600),
+            tile_step: int = 50,
+            density: float = 0.25,
+            n_bricks: int = 2,
+            min_distance: float = 0.5,
+            screen_color: Color = Color.GRAY,
+            boundaries_color: Color = Color.BLUE,
+            clock_fps: int = 60,
+            space_gravity: tuple[float, float] = (0, 0),
+            space_step: int = 60,
+    ):
+        """
+        Initialize a ProceduralSquareRaceGenerator.
+
+        :param screen_size (tuple[int, int], optional): The level's (width, height). Defaults to (400, 600).
+        :param tile_step (int, optional): The size of the boundary tiles. Must fit a brick. Defaults to 50.
+        :param density (float, optional): The probability of every tile to be a boundary tile. Defaults to 0.25.
+        :param n_bricks (int, optional): The number of bricks. Defaults to 2.
+        :param min_distance (float, optional): The victory line's minimal path distance from the start, as a
+            fraction of the longest path from the start. Defaults to 0.5.
+        :param screen_color (Color, optional): The screen color. Defaults to gray.
+        :param boundaries_color (Color, optional): The boundaries' color. Defaults to blue.
+        :param clock_fps (int, optional): The game's frame rate. Defaults to 60.
+        :param space_gravity (tuple[float, float], optional): The space's gravity. Defaults to (0, 0).
+        :param space_step (int, optional): The space's steps per second. Defaults to 60.
+        :raises ValueError: If the tiles are smaller than a brick or there are not enough colors for the bricks.
+        """
+        if tile_step < max(SquareRaceGameGenerator.SIZES[SquareRaceGameGenerator._BRICKS_ELEMENTS]):
+            raise ValueError(f"Tiles of size {tile_step} are smaller than a brick")
+        self.brick_colors = [c for c in Color if c not in (screen_color, boundaries_color, *self._RESERVED_COLORS)]
+        if n_bricks > len(self.brick_colors): raise ValueError(f"Not enough colors for {n_bricks} bricks")
+
+        self.screen_size = screen_size
+        self.tile_step = tile_step
+        self.density = density
+        self.n_bricks = n_bricks
+        self.min_distance = min_distance
+        self.screen_color = screen_color
+        self.boundaries_color = boundaries_color
+        self.clock_fps = clock_fps
+        self.space_gravity = space_gravity
+        self.space_step = space_step
+        self._shape = (-(-screen_size[0] // tile_step), -(-screen_size[1] // tile_step))
+
+    def generate(self, seed: int) -> Optional[dict]:
+        """
+        Generate the level data of the seed.
+
+        :return Optional[dict]: The level data, or `None` if no layout with a reachable victory line was drawn in
+            `_MAX_ATTEMPTS` attempts (e.g. when the density is too high).
+        """
+        rng = np.random.default_rng(seed)
+        for _ in range(self._MAX_ATTEMPTS):
+            occupied = rng.random(self._shape) < self.density
+            free = np.argwhere(~occupied)
+            if not len(free): continue
+            start = tuple(free[rng.integers(len(free))])
+            distances = self._distances(occupied, start)
+            if distances.max() < 1: continue
+            candidates = np.argwhere(distances >= max(self.min_distance * distances.max(), 1))
+            victory = tuple(candidates[rng.integers(len(candidates))])
+            return self._level_data(seed, rng, occupied, start, victory, tuple(free[rng.integers(len(free))]))
+        return None
+
+    def generate_many(self, n: int, seed: int = 0, catalog: LevelCatalog = None) -> list[tuple[int, str]]:
+        """
+        Generate `n` levels, of seeds `seed` to `seed + n - 1`, and save them to the level catalog. Seeds without a
+        valid layout are skipped.
+
+        :return list[tuple[int, str]]: The game number and level file path of every saved level.
+        """
+        catalog = catalog or LevelCatalog()
+        saved = []
+        for level_seed in range(seed, seed + n):
+            data = self.generate(level_seed)
+            if data is None: continue
+            number, path = catalog.allocate(self.GAME_NAME)
+            with open(path, "w") as f:
+                json.dump(data, f, indent=4)
+            catalog.register(self.GAME_NAME, number, path)
+            saved.append((number, path))
+        return saved
+
+    @staticmethod
+    def _distances(occupied: np.ndarray, start: tuple[int, int]) -> np.ndarray:
+        """
+        The path distance (in tiles) of every free tile from the start tile, or -1 for unreachable tiles, by a
+        breadth-first search that expands the whole frontier at once.
+        """
+        distances = np.full(occupied.shape, -1, dtype=np.int32)
+        distances[start] = 0
+        frontier = np.zeros(occupied.shape, dtype=bool)
+        frontier[start] = True
+        distance = 0
+        while frontier.any():
+            distance += 1
+            grown = np.zeros_like(frontier)
+            grown[1:] |= frontier[:-1]
+            grown[:-1] |= frontier[1:]
+            grown[:, 1:] |= frontier[:, :-1]
+            grown[:, :-1] |= frontier[:, 1:]
+            frontier = grown & ~occupied & (distances < 0)
+            distances[frontier] = distance
+        return distances
+
+    def _level_data(
+            self,
+            seed: int,
+            rng: np.random.Generator,
+            occupied: np.ndarray,
+            start: tuple[int, int],
+            victory: tuple[int, int],
+            logo: tuple[int, int]
+    ) -> dict:
+        step = self.tile_step
+        center = lambda tile: (int(tile[0]) * step + step // 2, int(tile[1]) * step + step // 2)
+        victory_x, victory_y = center(victory)
+        colors = [self.brick_colors[i].value for i in rng.choice(len(self.brick_colors), self.n_bricks, False)]
+
+        return {
+            **SquareRaceGameGenerator.settings_data(
+                seed, self.screen_size, self.screen_color.value, self.clock_fps, self.space_gravity,
+                self.space_step, center(logo)),
+            **SquareRaceGameGenerator.boundaries_data(
+                tile_map.border_rects(occupied, step), tile_map.border_lines(occupied, step, self.screen_size),
+                self.boundaries_color.value),
+            SquareRaceGameGenerator._BRICKS_ELEMENTS: SquareRaceGameGenerator.bricks_data(
+                center(start), colors, self._random_velocities(rng)),
+            SquareRaceGameGenerator._VICTORY_LINE_ELEMENTS: SquareRaceGameGenerator.victory_line_data(
+                (victory_x - step // 2, victory_y), (victory_x + step // 2, victory_y)),
+        }
+
+    def _random_velocities(self, rng: np.random.Generator) -> list[tuple[float, float]]:
+        """
+        Random brick velocities of norm 50, drawn like the interactive generator's.
+        """
+        v = np.array([i for i in range(-10, 10) if i != 0])
+        velocities = rng.choice(v, (self.n_bricks, 2)).astype(np.float64)
+        velocities *= 50 / np.linalg.norm(velocities, axis=1, keepdims=True)
+        return [tuple(velocity) for velocity in velocities.tolist()]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate Square Race levels into the level catalog.")
+    parser.add_argument("-n", "--count", type=int, default=10, help="number of levels to generate")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first level")
+    parser.add_argument("--width", type=int, default=400)
+    parser.add_argument("--height", type=int, default=600)
+    parser.add_argument("--tile-step", type=int, default=50)
+    parser.add_argument("--density", type=float, default=0.25, help="probability of a tile to be a boundary")
+    parser.add_argument("--bricks", type=int, default=2)
+    parser.add_argument("--min-distance", type=float, default=0.5,
+                        help="victory line distance from the start, as a fraction of the longest path")
+    parser.add_argument("--simulate", action="store_true", help="simulate the generated levels headlessly")
+    args = parser.parse_args()
+
+    generator = ProceduralSquareRaceGenerator((args.width, args.height), args.tile_step, args.density, args.bricks,
+                                              args.min_distance)
+    start_time = time.perf_counter()
+    levels = generator.generate_many(args.count, args.seed)
+    elapsed = time.perf_counter() - start_time
+    print(f"{len(levels)} of {args.count} levels generated in {elapsed:.2f} s "
+          f"({60 * len(levels) / max(elapsed, 1e-9):.0f} levels per minute)")
+
+    if args.simulate:
+        from games.batch_runner import BatchRunner
+
+        runner = BatchRunner()
+        print(runner.format_table(runner.run(path for _, path in levels)))
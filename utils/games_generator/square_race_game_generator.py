@@ -1,5 +1,3 @@
-import random
-
 import pygame
 
 from utils.colors import Color
@@ -44,23 +42,49 @@ class SquareRaceGameGenerator(GameGeneratorBase):
         _BRICKS_ELEMENTS: (15, 15),
     }
 
-    def __init__(self):
-        super().__init__(self._GAME_NAME)
+    # Keys panning the tiles' view, as (x, y) fractions of the view
+    _PAN_KEYS = {
+        pygame.K_LEFT: (-0.25, 0),
+        pygame.K_RIGHT: (0.25, 0),
+        pygame.K_UP: (0, -0.25),
+        pygame.K_DOWN: (0, 0.25),
+    }
+    _ZOOM_FACTOR = 1.25
+
+    def __init__(self, seed: int = None, tile_step: int = 50):
+        """
+        Initialize a SquareRaceGameGenerator.
+
+        :param seed (int, optional): The seed of the bricks' random velocities.
+        :param tile_step (int, optional): The size of the boundary tiles. Defaults to 50.
+        """
+        self._tile_step = tile_step
+        super().__init__(self._GAME_NAME, seed)
 
     def _draw(self):
         super()._draw()
         bricks_position_button = ControlElement.control_elements[self._BRICKS_POSITION_ELEMENT]
         victory_line_a_button = ControlElement.control_elements[self._VICTORY_LINE_A_ELEMENT]
         victory_line_b_button = ControlElement.control_elements[self._VICTORY_LINE_B_ELEMENT]
+        self.screen.set_clip(self._buttons[self._TILES_STR].rect)
 
         # Draw start point
         if bricks_position_button.value is not None:
             # Draws a small green circle
-            pygame.draw.circle(self.screen, Color.GREEN.value, bricks_position_button.value, 5)
+            pygame.draw.circle(self.screen, Color.GREEN.value, self._to_screen(bricks_position_button.value), 5)
 
             # Draw end line
         if victory_line_a_button.value and victory_line_b_button.value:
-            pygame.draw.line(self.screen, Color.RED.value, victory_line_a_button.value, victory_line_b_button.value, 4)
+            pygame.draw.line(self.screen, Color.RED.value, self._to_screen(victory_line_a_button.value),
+                             self._to_screen(victory_line_b_button.value), 4)
+        self.screen.set_clip(None)
+
+    def _to_world(self, position: tuple[float, float]) -> tuple[float, float]:
+        x, y = self._buttons[self._TILES_STR].to_world(position)
+        return round(x), round(y)
+
+    def _to_screen(self, position: tuple[float, float]) -> tuple[float, float]:
+        return self._buttons[self._TILES_STR].to_screen(position)
 
     def _get_control_elements(self) -> list[Button]:
         x, y = self._control_x, self._control_y
@@ -85,7 +109,8 @@ class SquareRaceGameGenerator(GameGeneratorBase):
     def _get_buttons(self) -> dict[str, Button]:
         return dict(
             **super()._get_buttons(),
-            **{self._TILES_STR: TilesButton(self.screen, (0, 0), (self.width, self.height))}
+            **{self._TILES_STR: TilesButton(self.screen, (0, 0), (self.width, self.height), step=self._tile_step,
+                                            map_size=self._map_size())}
         )
 
     def _add_data(self):
@@ -96,29 +121,13 @@ class SquareRaceGameGenerator(GameGeneratorBase):
 
     def _add_boundaries_data(self):
         color = ControlElement.control_elements[self._BOUNDARIES_COLOR_ELEMENT].get_value().value
-        borders = self._buttons[self._TILES_STR].border
-        borders_lines = self._buttons[self._TILES_STR].border_lines
-        self.data[self._BOUNDARIES_ELEMENTS] = [
-            {
-                self._POSITION_STR: (border.rect.x + border.rect.size[0] / 2, border.rect.y + border.rect.size[1] / 2),
-                self._SIZE_STR: border.rect.size,
-                self._GROUP_STR: self.GROUPS[self._BOUNDARIES_ELEMENTS],
-                self._COLOR_STR: color
-            } for border in borders
-        ]
-        self.data[self._BOUNDARIES_LINES_ELEMENTS] = [
-            {
-                self._A_CHR: a,
-                self._B_CHR: b,
-                self._GROUP_STR: self.GROUPS[self._BOUNDARIES_LINES_ELEMENTS],
-            } for [a, b] in borders_lines
-        ]
+        tiles_button = self._buttons[self._TILES_STR]
+        self.data |= self.boundaries_data(tiles_button.border_rects, tiles_button.border_lines, color)
 
-    @classmethod
-    def _get_random_velocity(cls) -> tuple[float, float]:
+    def _get_random_velocity(self) -> tuple[float, float]:
         v = [i for i in range(-10, 10)]
         v.remove(0)
-        vx, vy = random.choice(v), random.choice(v)
+        vx, vy = self._random.choice(v), self._random.choice(v)
         norm = 50 / float((vx ** 2 + vy ** 2) ** 0.5)
         return vx * norm, vy * norm
 
@@ -126,19 +135,72 @@ class SquareRaceGameGenerator(GameGeneratorBase):
         bricks_colors_buttons = ControlElement.control_elements[self._BRICKS_COLORS_ELEMENT].colors_buttons
         start_position = ControlElement.control_elements[self._BRICKS_POSITION_ELEMENT].value
         colors = [button.color.value for button in bricks_colors_buttons]
-        self.data[self._BRICKS_ELEMENTS] = [
-            {
-                self._POSITION_STR: start_position,
-                self._SIZE_STR: self.SIZES[self._BRICKS_ELEMENTS],
-                self._VELOCITY_STR: self._get_random_velocity(),
-                self._GROUP_STR: self.GROUPS[self._BRICKS_ELEMENTS] + i,
-                self._COLOR_STR: colors[i]
-            } for i in range(len(colors))
-        ]
+        velocities = [self._get_random_velocity() for _ in colors]
+        self.data[self._BRICKS_ELEMENTS] = self.bricks_data(start_position, colors, velocities)
 
     def _add_victory_line_data(self):
         victory_line_a = ControlElement.control_elements[self._VICTORY_LINE_A_ELEMENT].value
         victory_line_b = ControlElement.control_elements[self._VICTORY_LINE_B_ELEMENT].value
+        self.data[self._VICTORY_LINE_ELEMENTS] = self.victory_line_data(victory_line_a, victory_line_b)
+
+    @classmethod
+    def boundaries_data(
+            cls,
+            rects: list[tuple[int, int, int, int]],
+            lines: list[list[tuple[float, float]]],
+            color: tuple
+    ) -> dict:
+        """
+        The boundaries and boundaries lines game data.
+
+        :param rects: The (left, top, width, height) of the boundary tiles.
+        :param lines: The [a, b] border lines around the boundary tiles.
+        :param color: The boundaries' color.
+        """
+        return {
+            cls._BOUNDARIES_ELEMENTS: [
+                {
+                    cls._POSITION_STR: (x + w / 2, y + h / 2),
+                    cls._SIZE_STR: (w, h),
+                    cls._GROUP_STR: cls.GROUPS[cls._BOUNDARIES_ELEMENTS],
+                    cls._COLOR_STR: color
+                } for x, y, w, h in rects
+            ],
+            cls._BOUNDARIES_LINES_ELEMENTS: [
+                {
+                    cls._A_CHR: a,
+                    cls._B_CHR: b,
+                    cls._GROUP_STR: cls.GROUPS[cls._BOUNDARIES_LINES_ELEMENTS],
+                } for [a, b] in lines
+            ],
+        }
+
+    @classmethod
+    def bricks_data(
+            cls,
+            start_position: tuple[float, float],
+            colors: list[tuple],
+            velocities: list[tuple[float, float]]
+    ) -> list[dict]:
+        """
+        The bricks game data: a brick of every color, starting at `start_position` with its velocity.
+        """
+        return [
+            {
+                cls._POSITION_STR: start_position,
+                cls._SIZE_STR: cls.SIZES[cls._BRICKS_ELEMENTS],
+                cls._VELOCITY_STR: velocity,
+                cls._GROUP_STR: cls.GROUPS[cls._BRICKS_ELEMENTS] + i,
+                cls._COLOR_STR: color
+            } for i, (color, velocity) in enumerate(zip(colors, velocities))
+        ]
+
+    @classmethod
+    def victory_line_data(cls, victory_line_a: tuple[int, int], victory_line_b: tuple[int, int]) -> list[dict]:
+        """
+        The victory line game data: a checkered line of boxes from `victory_line_a` to `victory_line_b`, which must
+        be a horizontal or vertical line with integer ends.
+        """
         dx, dy = abs(victory_line_a[0] - victory_line_b[0]), abs(victory_line_a[1] - victory_line_b[1])
         a, b = min(victory_line_a[0], victory_line_b[0]), min(victory_line_a[1], victory_line_b[1])
         box_size = 6
@@ -146,11 +208,11 @@ class SquareRaceGameGenerator(GameGeneratorBase):
             [a - box_size // 2, a + box_size // 2], [b + y for y in range(0, dy, box_size)]) if dx == 0 else (
             [a + x for x in range(0, dx, box_size)], [b - box_size // 2, b + box_size // 2])
 
-        self.data[self._VICTORY_LINE_ELEMENTS] = [{
-            self._POSITION_STR: (x, y),
-            self._SIZE_STR: (box_size, box_size),
-            self._COLOR_STR: Color.BLACK.value if (x_pos.index(x) + y_pos.index(y)) % 2 == 0 else Color.WHITE.value,
-            self._GROUP_STR: self.GROUPS[self._VICTORY_LINE_ELEMENTS]
+        return [{
+            cls._POSITION_STR: (x, y),
+            cls._SIZE_STR: (box_size, box_size),
+            cls._COLOR_STR: Color.BLACK.value if (x_pos.index(x) + y_pos.index(y)) % 2 == 0 else Color.WHITE.value,
+            cls._GROUP_STR: cls.GROUPS[cls._VICTORY_LINE_ELEMENTS]
 
         } for x in x_pos for y in y_pos]
 
@@ -167,8 +229,8 @@ class SquareRaceGameGenerator(GameGeneratorBase):
 
         if not SelectPointButton.is_select_mode(): tiles_button.set_value(mouse_position)
 
-        SelectPointButton.set_waiting(mouse_position)
-        for b in ControlElement.control_elements.values():
+        SelectPointButton.set_waiting(mouse_position, self._to_world)
+        for b in ControlElement.buttons_at(mouse_position):
             if b != bricks_number_button: b.set_value(mouse_position)
 
         if color_range_button.click(mouse_position):
@@ -179,6 +241,8 @@ class SquareRaceGameGenerator(GameGeneratorBase):
             bricks_number_button.set_value(mouse_position)
             bricks_colors_button.reset_n_colors(bricks_number_button.value)
 
+        tiles_button.resize_map(self._map_size())
+
         if victory_line_a_button.value and victory_line_b_button.value:
             dx = abs(victory_line_a_button.value[0] - victory_line_b_button.value[0])
             dy = abs(victory_line_a_button.value[1] - victory_line_b_button.value[1])
@@ -193,6 +257,23 @@ class SquareRaceGameGenerator(GameGeneratorBase):
                 for button in ControlElement.control_elements.values() if isinstance(button, SelectPointButton)
             ]): self._running = False
 
+    def _mouse_wheel_handler(self, mouse_position: tuple[float, float], y: int):
+        tiles_button = self._buttons[self._TILES_STR]
+        if tiles_button.click(mouse_position): tiles_button.zoom(self._ZOOM_FACTOR ** y, anchor=mouse_position)
+
+    def _key_down_handler(self, key: int):
+        if key in self._PAN_KEYS:
+            tiles_button = self._buttons[self._TILES_STR]
+            fx, fy = self._PAN_KEYS[key]
+            tiles_button.pan(fx * tiles_button.rect.w, fy * tiles_button.rect.h)
+
+    def _map_size(self) -> tuple[int, int]:
+        """
+        The level's size, set by the screen width and height elements.
+        """
+        return ControlElement.control_elements[self._SCREEN_WIDTH_ELEMENT].value, \
+            ControlElement.control_elements[self._SCREEN_HEIGHT_ELEMENT].value
+
 
 if __name__ == '__main__':
     game_generator = SquareRaceGameGenerator()
@@ -0,0 +1,42 @@
+import numpy as np
+
+
+def border_rects(occupied: np.ndarray, step: int) -> list[tuple[int, int, int, int]]:
+    """
+    The (left, top, width, height) of the boundary tiles of a (columns, rows) occupancy array, by column and row.
+    """
+    columns, rows = np.nonzero(occupied)
+    return [(c * step, r * step, step, step) for c, r in zip(columns.tolist(), rows.tolist())]
+
+
+def border_lines(occupied: np.ndarray, step: int, map_size: tuple[int, int]) -> list[list[tuple[int, int]]]:
+    """
+    The outline of the map followed by every tile edge between a boundary tile and a free tile (or the outside of
+    the grid), as [a, b] lines.
+    """
+    return outline(map_size) + edges(occupied, step)
+
+
+def outline(map_size: tuple[int, int]) -> list[list[tuple[int, int]]]:
+    w, h = map_size
+    return [
+        [(0, 0), (w, 0)],
+        [(0, 0), (0, h)],
+        [(w, 0), (w, h)],
+        [(0, h), (w, h)]
+    ]
+
+
+def edges(occupied: np.ndarray, step: int, column: int = 0, row: int = 0) -> list[list[tuple[int, int]]]:
+    """
+    The tile edges between an occupied tile and a free one (or the outside) in the occupancy array, whose top-left
+    tile is (column, row) of the map.
+    """
+    padded = np.pad(occupied, 1)
+    vertical = np.argwhere(padded[1:, 1:-1] != padded[:-1, 1:-1]) + (column, row)  # (column of the edge, row)
+    horizontal = np.argwhere(padded[1:-1, 1:] != padded[1:-1, :-1]) + (column, row)  # (column, row of the edge)
+    return [
+        [(c * step, r * step), (c * step, (r + 1) * step)] for c, r in vertical.tolist()
+    ] + [
+        [(c * step, r * step), ((c + 1) * step, r * step)] for c, r in horizontal.tolist()
+    ]
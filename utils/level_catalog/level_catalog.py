@@ -0,0 +1,170 @@
+import os
+import re
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+from typing import Iterator, Optional
+
+GAMES_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "games_data")
+CATALOG_FILE = os.path.join(GAMES_DATA_DIR, "catalog.sqlite")
+
+_LEVEL_FILE_RE = re.compile(r"^(?P<game>.+)_data_(?P<n>\d+)\.json$")
+
+
+class LevelCatalog:
+    """
+    Index of the game levels, mapping every game number to its level file, recording and upload.
+
+    Game numbers are allocated atomically by SQLite, so generators and games running in parallel processes never
+    get the same number, and looking a level up is an index lookup that does not slow down as the `games_data`
+    folder grows. Level files saved to `data_dir` outside the catalog are added to it whenever it is opened.
+    """
+
+    def __init__(self, path: str = CATALOG_FILE, data_dir: str = GAMES_DATA_DIR):
+        """
+        Initialize a LevelCatalog, creating the catalog file if needed.
+
+        :param path (str, optional): The SQLite file of the catalog. Defaults to `CATALOG_FILE`.
+        :param data_dir (str, optional): The folder of the level files. Defaults to `GAMES_DATA_DIR`.
+        """
+        self.path = path
+        self.data_dir = data_dir
+        with self._connect() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS levels (
+                    game TEXT NOT NULL,
+                    number INTEGER NOT NULL,
+                    path TEXT,
+                    recording_path TEXT,
+                    upload_id INTEGER,
+                    created REAL NOT NULL,
+                    PRIMARY KEY (game, number)
+                )
+            """)
+        if os.path.isdir(self.data_dir): self.import_dir()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        A connection to the catalog that commits on success, rolls back on error and is closed on exit.
+        """
+        with closing(sqlite3.connect(self.path, timeout=30)) as connection, connection:
+            yield connection
+
+    @staticmethod
+    def game_key(game_name: str) -> str:
+        """
+        The key of a game in the catalog, which is also the prefix of its level files, e.g. "square_race_game".
+        """
+        return game_name.lower().replace(' ', '_')
+
+    def level_file(self, game_name: str, n: int) -> str:
+        """
+        The path of the level file of game number `n`.
+        """
+        return os.path.join(self.data_dir, f"{self.game_key(game_name)}_data_{n}.json")
+
+    def import_dir(self):
+        """
+        Add the level files found in `data_dir` that are not in the catalog yet, including files of game numbers
+        that were allocated but never registered.
+        """
+        rows = [(m["game"], int(m["n"]), os.path.join(self.data_dir, f), time.time())
+                for f in os.listdir(self.data_dir) if (m := _LEVEL_FILE_RE.match(f))]
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT INTO levels (game, number, path, created) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (game, number) DO UPDATE SET path = excluded.path WHERE path IS NULL", rows)
+
+    def allocate(self, game_name: str) -> tuple[int, str]:
+        """
+        Reserve the next game number of the game.
+
+        :return tuple[int, str]: The game number and the path its level file should be saved to.
+        """
+        game = self.game_key(game_name)
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "INSERT INTO levels (game, number, created) "
+                "SELECT ?, COALESCE(MAX(number), -1) + 1, ? FROM levels WHERE game = ?",
+                (game, time.time(), game))
+            n = connection.execute("SELECT number FROM levels WHERE rowid = ?", (cursor.lastrowid,)).fetchone()[0]
+        return n, self.level_file(game_name, n)
+
+    def register(self, game_name: str, n: int, path: str):
+        """
+        Record that the level file of game number `n` was saved to `path`.
+        """
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO levels (game, number, path, created) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (game, number) DO UPDATE SET path = excluded.path",
+                (self.game_key(game_name), n, path, time.time()))
+
+    def latest(self, game_name: str) -> Optional[int]:
+        """
+        The number of the latest saved level of the game, or `None` if there is none.
+        """
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT MAX(number) FROM levels WHERE game = ? AND path IS NOT NULL",
+                (self.game_key(game_name),)).fetchone()
+        return row[0]
+
+    def level_path(self, game_name: str, n: int = -1) -> str:
+        """
+        The path of the level file of game number `n`, or of the latest level if `n` is -1. A level file saved to
+        `data_dir` since the catalog was opened is registered on its first lookup.
+
+        :raises FileNotFoundError: If the level is neither in the catalog nor in `data_dir`.
+        """
+        if n == -1: n = self.latest(game_name)
+        path = self._get(game_name, n, "path")
+        if path is None and n is not None and os.path.isfile(level_file := self.level_file(game_name, n)):
+            self.register(game_name, n, path := level_file)
+        if path is None: raise FileNotFoundError(f"No level {n} of {game_name} in the catalog")
+        return path
+
+    def level_number(self, game_name: str, path: str) -> Optional[int]:
+        """
+        The game number of the level saved to `path`, or `None` if the file is not in the catalog.
+        """
+        with self._connect() as connection:
+            row = connection.execute("SELECT number FROM levels WHERE game = ? AND path IN (?, ?)",
+                                     (self.game_key(game_name), path, os.path.abspath(path))).fetchone()
+        return row[0] if row else None
+
+    def levels(self, game_name: str) -> list[tuple[int, str]]:
+        """
+        The (game number, level file path) of every saved level of the game, by game number.
+        """
+        with self._connect() as connection:
+            return connection.execute(
+                "SELECT number, path FROM levels WHERE game = ? AND path IS NOT NULL ORDER BY number",
+                (self.game_key(game_name),)).fetchall()
+
+    def set_recording(self, game_name: str, n: int, recording_path: str):
+        self._set(game_name, n, "recording_path", recording_path)
+
+    def recording_path(self, game_name: str, n: int) -> Optional[str]:
+        return self._get(game_name, n, "recording_path")
+
+    def set_upload(self, game_name: str, n: int, upload_id: int):
+        """
+        Record the id of the game recording's upload in the `UploadQueue`.
+        """
+        self._set(game_name, n, "upload_id", upload_id)
+
+    def upload_id(self, game_name: str, n: int) -> Optional[int]:
+        return self._get(game_name, n, "upload_id")
+
+    def _get(self, game_name: str, n: int, column: str):
+        with self._connect() as connection:
+            row = connection.execute(f"SELECT {column} FROM levels WHERE game = ? AND number = ?",
+                                     (self.game_key(game_name), n)).fetchone()
+        return row[0] if row else None
+
+    def _set(self, game_name: str, n: int, column: str, value):
+        with self._connect() as connection:
+            connection.execute(f"UPDATE levels SET {column} = ? WHERE game = ? AND number = ?",
+                               (value, self.game_key(game_name), n))
@@ -0,0 +1,75 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+
+class BinaryLevel:
+    """
+    Compact binary level: the level's settings (screen, clock, space, logo, ...) and its homogeneous arrays, e.g.
+    tile rectangles, segment endpoints and brick states, as typed numeric blocks.
+
+    The file is a small header and a JSON description of the settings and blocks, followed by the raw blocks, each
+    aligned to 8 bytes. Loading memory-maps the file and returns views of the blocks, so no parsing happens beyond
+    the header. JSON stays the import/export format; each game defines how its JSON levels map to blocks.
+    """
+    EXTENSION = ".lvl"
+    _MAGIC = b"GRLV"
+    _VERSION = 1
+    _ALIGNMENT = 8
+    # magic, version, size of the JSON description
+    _HEADER = struct.Struct("<4sHI")
+
+    def __init__(self, settings: dict, blocks: dict[str, np.ndarray]):
+        """
+        Initialize a BinaryLevel.
+
+        :param settings (dict): The level's settings, saved as JSON.
+        :param blocks (dict[str, np.ndarray]): The level's arrays by name.
+        """
+        self.settings = settings
+        self.blocks = blocks
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.blocks[name]
+
+    def save(self, path: str):
+        offset, layout = 0, dict()
+        for name, block in self.blocks.items():
+            layout[name] = {"dtype": block.dtype.str, "shape": list(block.shape), "offset": offset}
+            offset += -(-block.nbytes // self._ALIGNMENT) * self._ALIGNMENT
+        description = json.dumps({"settings": self.settings, "blocks": layout}).encode()
+        description += b" " * (-(self._HEADER.size + len(description)) % self._ALIGNMENT)
+
+        with open(path, "wb") as f:
+            f.write(self._HEADER.pack(self._MAGIC, self._VERSION, len(description)))
+            f.write(description)
+            for name, block in self.blocks.items():
+                data = np.ascontiguousarray(block).tobytes()
+                f.write(data + b"\0" * (-len(data) % self._ALIGNMENT))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "BinaryLevel":
+        """
+        Load a level saved with `save`.
+
+        :param mmap: Map the blocks from the file (read-only) instead of reading them into memory.
+        :raises ValueError: If the file is not a binary level of a supported version.
+        """
+        with open(path, "rb") as f:
+            magic, version, size = cls._HEADER.unpack(f.read(cls._HEADER.size))
+            if magic != cls._MAGIC or version != cls._VERSION:
+                raise ValueError(f"{path} is not a version {cls._VERSION} binary level")
+            description = json.loads(f.read(size))
+            start = f.tell()
+            mmap = mmap and os.path.getsize(path) > start  # An empty region cannot be mapped
+            data = np.frombuffer(f.read(), np.uint8) if not mmap else None
+
+        buffer = np.memmap(path, dtype=np.uint8, mode="r", offset=start) if mmap else data
+        blocks = dict()
+        for name, layout in description["blocks"].items():
+            dtype, shape, offset = np.dtype(layout["dtype"]), tuple(layout["shape"]), layout["offset"]
+            count = int(np.prod(shape))
+            blocks[name] = buffer[offset:offset + count * dtype.itemsize].view(dtype).reshape(shape)
+        return cls(description["settings"], blocks)
@@ -0,0 +1,142 @@
+from itertools import groupby
+
+_POSITION_STR, _SIZE_STR, _COLOR_STR, _GROUP_STR, _RECTS_STR = "position", "size", "color", "group", "rects"
+_A_CHR, _B_CHR = "a", "b"
+_EPSILON = 1e-3
+
+RECT = tuple[float, float, float, float]  # left, top, width, height
+
+
+def merge_rects(rects: list[RECT]) -> list[RECT]:
+    """
+    Merge adjacent axis-aligned rectangles into larger ones.
+
+    Rectangles are first merged into horizontal runs (same row and height, touching edges), then runs with the same
+    columns and width are merged vertically. For tiles painted on a grid this leaves one rectangle per maximal
+    block instead of one per tile.
+
+    :param rects: The rectangles to merge as (left, top, width, height).
+    :return list[RECT]: The merged rectangles.
+    """
+    runs = []
+    for _, row in groupby(sorted(rects, key=lambda r: (r[1], r[3], r[0])), key=lambda r: (r[1], r[3])):
+        for left, top, w, h in row:
+            if runs and runs[-1][1] == top and runs[-1][3] == h and runs[-1][0] + runs[-1][2] == left:
+                runs[-1][2] += w
+            else:
+                runs.append([left, top, w, h])
+
+    merged = []
+    for _, column in groupby(sorted(runs, key=lambda r: (r[0], r[2], r[1])), key=lambda r: (r[0], r[2])):
+        for left, top, w, h in column:
+            if merged and merged[-1][0] == left and merged[-1][2] == w and merged[-1][1] + merged[-1][3] == top:
+                merged[-1][3] += h
+            else:
+                merged.append([left, top, w, h])
+    return [tuple(rect) for rect in merged]
+
+
+def compile_boundaries(boundaries_data: list[dict]) -> list[dict]:
+    """
+    Compile the level's boundary tiles into `CompoundBoundary` data.
+
+    Tiles are merged with `merge_rects`, one compound boundary per (color, group).
+
+    :param boundaries_data: The level's `boundaries` entries (position, size, group, color).
+    :return list[dict]: Keyword arguments for `CompoundBoundary` (rects, color, group).
+    """
+    compiled = dict()
+    for data in boundaries_data:
+        (x, y), (w, h) = data[_POSITION_STR], data[_SIZE_STR]
+        key = (tuple(data[_COLOR_STR]), data[_GROUP_STR])
+        compiled.setdefault(key, []).append((x - w / 2, y - h / 2, w, h))
+    return [
+        {
+            _RECTS_STR: [((left + w / 2, top + h / 2), (w, h)) for left, top, w, h in merge_rects(rects)],
+            _COLOR_STR: color,
+            _GROUP_STR: group,
+        } for (color, group), rects in compiled.items()
+    ]
+
+
+def _union(intervals: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    """
+    Merge overlapping and touching intervals.
+    """
+    union = []
+    for low, high in sorted(intervals):
+        if union and low <= union[-1][1] + _EPSILON:
+            union[-1][1] = max(union[-1][1], high)
+        else:
+            union.append([low, high])
+    return [tuple(interval) for interval in union]
+
+
+def _covered(horizontal: bool, coordinate: float, side: int, rects: list[RECT]) -> list[tuple[float, float]]:
+    """
+    The intervals along an axis-aligned line whose given side is covered by rectangles, i.e. where the line lies
+    on a face (or inside) of a rectangle.
+    """
+    axis, other = (0, 1) if horizontal else (1, 0)
+    probe = coordinate + side * _EPSILON
+    return [(rect[axis], rect[axis] + rect[axis + 2]) for rect in rects
+            if rect[other] < probe < rect[other] + rect[other + 2]]
+
+
+def _subtract(interval: tuple[float, float], removed: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    """
+    The parts of the interval outside the (merged, sorted) removed intervals.
+    """
+    start, end = interval
+    parts = []
+    for low, high in removed:
+        if high <= start or low >= end: continue
+        if low > start: parts.append((start, low))
+        start = max(start, high)
+    if end > start: parts.append((start, end))
+    return [(low, high) for low, high in parts if high - low > _EPSILON]
+
+
+def compile_boundaries_lines(boundaries_lines_data: list[dict], boundaries_data: list[dict],
+                             screen_size: tuple[float, float]) -> list[dict]:
+    """
+    Join collinear boundary lines and drop the parts that the boundary tiles already cover.
+
+    Axis-aligned lines of the same group that lie on the same line and overlap or touch are joined into one line.
+    The parts of a line that lie on a face of a (merged) boundary tile, or between two tiles, are dropped, since the
+    tile stops the bricks there; so are lines outside the screen. What is left is one line per straight stretch of
+    the track outline that is not a tile face, e.g. the screen edges between tiles. Lines that are not axis-aligned
+    are kept as they are.
+
+    :param boundaries_lines_data: The level's `boundaries_lines` entries (a, b, group).
+    :param boundaries_data: The level's `boundaries` entries (position, size, group, color).
+    :param screen_size: The screen (width, height).
+    :return list[dict]: The compiled `boundaries_lines` entries.
+    """
+    rects = merge_rects([
+        (data[_POSITION_STR][0] - data[_SIZE_STR][0] / 2, data[_POSITION_STR][1] - data[_SIZE_STR][1] / 2,
+         *data[_SIZE_STR]) for data in boundaries_data
+    ])
+    lines = dict()  # (horizontal, coordinate, group) -> intervals along the line, or an index for other lines
+    for i, data in enumerate(boundaries_lines_data):
+        (ax, ay), (bx, by) = data[_A_CHR], data[_B_CHR]
+        if ay == by:
+            lines.setdefault((True, ay, data[_GROUP_STR]), []).append(tuple(sorted((ax, bx))))
+        elif ax == bx:
+            lines.setdefault((False, ax, data[_GROUP_STR]), []).append(tuple(sorted((ay, by))))
+        else:
+            lines[i] = data
+
+    compiled = []
+    for key, intervals in lines.items():
+        if not isinstance(key, tuple):
+            compiled.append(intervals)
+            continue
+        horizontal, coordinate, group = key
+        if not 0 <= coordinate <= screen_size[1 if horizontal else 0]: continue
+        removed = _union(_covered(horizontal, coordinate, -1, rects) + _covered(horizontal, coordinate, 1, rects))
+        for interval in _union(intervals):
+            for low, high in _subtract(interval, removed):
+                a, b = ((low, coordinate), (high, coordinate)) if horizontal else ((coordinate, low), (coordinate, high))
+                compiled.append({_A_CHR: a, _B_CHR: b, _GROUP_STR: group})
+    return compiled
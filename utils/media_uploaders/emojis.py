@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from utils.colors import Color
 
 _EMOJI_RANGES = [
@@ -11,10 +13,14 @@ _EMOJI_RANGES = [
     (0x1FA70, 0x1FAFF),  # Extended Pictographs
 ]
 
-# Loop through all emoji ranges and print them
-ALL_EMOJIS = []
-for start, end in _EMOJI_RANGES:
-    ALL_EMOJIS.extend(chr(code) for code in range(start, end + 1))
+
+@lru_cache(1)
+def get_all_emojis() -> list[str]:
+    """
+    Every emoji in the emoji ranges, built on first use.
+    """
+    return [chr(code) for start, end in _EMOJI_RANGES for code in range(start, end + 1)]
+
 
 color_emoji_mapping = {
     Color.BLACK: "🖤",  # Black Heart
@@ -1,13 +1,13 @@
 import os
 from pathlib import Path
-
-from instagrapi import Client
+from typing import Any, Optional
 
 from utils.colors import Color
+from utils.level_catalog.level_catalog import LevelCatalog
 from utils.media_uploaders.emojis import color_emoji_mapping
-from utils.private_parms import ACCOUNT_USER_NAME, ACCOUNT_PASSWORD
+from utils.media_uploaders.upload_queue import UploadQueue
 
-VIDEO_DIR = r"C:\ws\pygame_projects\utils\game_recorder\game_recordings"
+SESSION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "session.json")
 
 
 class ReelUploader:
@@ -17,23 +17,28 @@ class ReelUploader:
     This class is responsible for managing the upload process, integrating with the social media
     client, and formatting the data (e.g., text overlays and player colors) for sharing as Reels or other formats.
 
+    The social media client is created and logged in on the first upload only, and its session is saved to
+    `SESSION_FILE` and reused by later runs. Uploads can be queued in the durable `UploadQueue` and sent later
+    by a worker, together over the same session.
+
     Attributes:
-        :param client (Client): An authenticated instance of the social media upload client.
+        :param _client (Client): The shared authenticated social media client, created on first use.
     """
-    client = Client()
-    client.login(ACCOUNT_USER_NAME, ACCOUNT_PASSWORD)
-    def __init__(self, game_name: str, game_number: int, text: str = None, players_color: list[tuple] = None):
+    _client = None
+
+    def __init__(self, game_name: str, game_number: Optional[int], text: str = None, players_color: list[tuple] = None):
         """
         Initialize a ReelUploader instance.
 
         Args:
             :param game_name (str): The name of the game to associate with the upload.
-            :param game_number (int): The game number to uniquely identify the recording session.
+            :param game_number (Optional[int]): The game number to uniquely identify the recording session, or
+                `None` for a level that is not in the level catalog.
             :param text (str, optional): Custom text to overlay on the uploaded content.
             :param players_color (list[tuple], optional): A list of RGB(A) color tuples corresponding to the players' colors.
         """
-        self.file_prefix = f"{game_name} {game_number}"
         self.game_name = game_name
+        self.game_number = game_number
         self._title = f"🎮 {game_name.title()} 🏁"
         self._hash_tags = " #".join([
             "#game",
@@ -48,7 +53,33 @@ class ReelUploader:
         self._text = text
         self._colors = players_color
 
-    def upload(self):
+    @classmethod
+    def get_client(cls) -> Any:
+        """
+        Get the shared social media client, logging in on first use.
+
+        A saved session is loaded from `SESSION_FILE` before logging in, so the platform reuses it instead of
+        starting a new one, and the (possibly refreshed) session is saved back.
+        """
+        if cls._client is None:
+            from instagrapi import Client
+            from utils.private_parms import ACCOUNT_USER_NAME, ACCOUNT_PASSWORD
+
+            client = Client()
+            if os.path.exists(SESSION_FILE): client.load_settings(SESSION_FILE)
+            client.login(ACCOUNT_USER_NAME, ACCOUNT_PASSWORD)
+            client.dump_settings(SESSION_FILE)
+            cls._client = client
+        return cls._client
+
+    @classmethod
+    def set_client(cls, client: Any):
+        """
+        Use the given client for all uploads, e.g. a local stub when working offline.
+        """
+        cls._client = client
+
+    def upload(self, video_path: str = None):
         """
         Upload the game recording to the designated social media platform.
 
@@ -56,18 +87,49 @@ class ReelUploader:
         and visual customization (e.g., player colors), and performs the upload. It ensures that all
         parameters are correctly formatted before attempting to upload the video as a Reel.
 
+        :param video_path: The recording to upload. Defaults to the recording of the game in the level catalog.
+
         Raises:
             UploadError: If the upload process encounters an issue during execution.
         """
+        self.upload_file(video_path or self._get_latest_video(), self._get_caption())
 
-        video_file = max(
-            [file for file in os.listdir(VIDEO_DIR) if file.startswith(self.file_prefix) and file.endswith("mp4")])
-        media = self.client.clip_upload(
-            Path(fr"{VIDEO_DIR}\\{video_file}"),
-            self._get_caption()
-        )
+    def queue(self, video_path: str = None, upload_queue: UploadQueue = None) -> int:
+        """
+        Queue the game recording for upload, returning immediately.
+
+        The recording is uploaded by the upload queue's worker (`python -m utils.media_uploaders.upload_queue`)
+        or by `upload_queued`.
+
+        :param video_path: The recording to upload. Defaults to the recording of the game in the level catalog.
+        :param upload_queue: The queue to add the recording to. Defaults to the shared on-disk queue.
+        :return int: The id of the queued upload.
+        """
+        return (upload_queue or UploadQueue()).enqueue(video_path or self._get_latest_video(), self._get_caption())
+
+    @classmethod
+    def upload_queued(cls, upload_queue: UploadQueue = None) -> int:
+        """
+        Upload every queued recording over the same authenticated session.
+
+        :return int: The number of recordings uploaded successfully.
+        """
+        return (upload_queue or UploadQueue()).drain(cls.upload_file)
+
+    @classmethod
+    def upload_file(cls, video_path: str, caption: str):
+        """
+        Upload a video with the given caption as a Reel.
+        """
+        media = cls.get_client().clip_upload(Path(video_path), caption)
         print(f"Reel uploaded successfully: {media.dict()}")
 
+    def _get_latest_video(self) -> str:
+        video_path = None if self.game_number is None else \
+            LevelCatalog().recording_path(self.game_name, self.game_number)
+        if video_path is None: raise FileNotFoundError(f"No recording of {self.game_name} {self.game_number}")
+        return video_path
+
     def _get_caption(self) -> str:
         texts = [self._title]
         if self._text: texts.append(self._text)
@@ -0,0 +1,134 @@
+import os
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+from typing import Callable, Iterator, Optional
+
+QUEUE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "upload_queue.sqlite")
+
+
+class UploadQueue:
+    """
+    Durable on-disk queue of recordings waiting to be uploaded.
+
+    Games enqueue their recordings and return immediately, and a separate worker (run this module) drains the
+    queue: uploads are retried with exponential backoff and spaced at least `min_interval` seconds apart. The
+    queue is a SQLite table, so it survives restarts and can be shared by games running in other processes.
+    Only one worker should drain a queue at a time.
+    """
+    PENDING, UPLOADING, DONE, FAILED = "pending", "uploading", "done", "failed"
+
+    def __init__(self, path: str = QUEUE_FILE, max_attempts: int = 5, backoff: float = 60.0,
+                 min_interval: float = 30.0):
+        """
+        Initialize an UploadQueue, creating its table if needed.
+
+        :param path (str, optional): The SQLite file of the queue. Defaults to `QUEUE_FILE`.
+        :param max_attempts (int, optional): Attempts before an upload is marked as failed. Defaults to 5.
+        :param backoff (float, optional): Seconds to wait before the first retry, doubled after every failed
+            attempt. Defaults to 60.
+        :param min_interval (float, optional): Minimal number of seconds between two uploads. Defaults to 30.
+        """
+        self.path = path
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.min_interval = min_interval
+        with self._connect() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS uploads (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    video_path TEXT NOT NULL,
+                    caption TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt REAL NOT NULL,
+                    error TEXT
+                )
+            """)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        A connection to the queue that commits on success, rolls back on error and is closed on exit.
+        """
+        with closing(sqlite3.connect(self.path, timeout=30)) as connection, connection:
+            yield connection
+
+    def enqueue(self, video_path: str, caption: str) -> int:
+        """
+        Add a recording to the queue.
+
+        :return int: The id of the queued upload.
+        """
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "INSERT INTO uploads (video_path, caption, status, next_attempt) VALUES (?, ?, ?, ?)",
+                (video_path, caption, self.PENDING, time.time()))
+            return cursor.lastrowid
+
+    def status(self, upload_id: int) -> Optional[str]:
+        with self._connect() as connection:
+            row = connection.execute("SELECT status FROM uploads WHERE id = ?", (upload_id,)).fetchone()
+        return row[0] if row else None
+
+    def pending(self) -> int:
+        """
+        The number of uploads waiting to be sent, including the ones waiting for a retry.
+        """
+        with self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM uploads WHERE status = ?", (self.PENDING,)).fetchone()[0]
+
+    def _claim(self) -> Optional[tuple[int, str, str, int]]:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT id, video_path, caption, attempts FROM uploads WHERE status = ? AND next_attempt <= ? "
+                "ORDER BY id LIMIT 1", (self.PENDING, time.time())).fetchone()
+            if row is None: return None
+            connection.execute("UPDATE uploads SET status = ? WHERE id = ?", (self.UPLOADING, row[0]))
+        return row
+
+    def drain(self, upload: Callable[[str, str], None], forever: bool = False, poll_interval: float = 5.0) -> int:
+        """
+        Upload the queued recordings.
+
+        :param upload: Uploads a single (video path, caption), raising an exception on failure.
+        :param forever: Keep waiting for new uploads instead of returning once nothing is left to upload.
+        :param poll_interval: Seconds to wait between checks for new or retried uploads.
+        :return int: The number of recordings uploaded successfully.
+        """
+        with self._connect() as connection:  # Uploads interrupted by a previous worker are retried
+            connection.execute("UPDATE uploads SET status = ? WHERE status = ?", (self.PENDING, self.UPLOADING))
+
+        uploaded, last_upload = 0, 0.0
+        while True:
+            row = self._claim()
+            if row is None:
+                if not forever and self.pending() == 0: return uploaded
+                time.sleep(poll_interval)
+                continue
+
+            upload_id, video_path, caption, attempts = row
+            time.sleep(max(0.0, last_upload + self.min_interval - time.time()))
+            last_upload = time.time()
+            try:
+                upload(video_path, caption)
+            except Exception as e:
+                attempts += 1
+                status = self.FAILED if attempts >= self.max_attempts else self.PENDING
+                next_attempt = time.time() + self.backoff * 2 ** (attempts - 1)
+                print(f"Upload of {video_path} failed ({attempts}/{self.max_attempts}): {e!r}")
+                with self._connect() as connection:
+                    connection.execute("UPDATE uploads SET status = ?, attempts = ?, next_attempt = ?, error = ? "
+                                       "WHERE id = ?", (status, attempts, next_attempt, repr(e), upload_id))
+                continue
+
+            uploaded += 1
+            with self._connect() as connection:
+                connection.execute("UPDATE uploads SET status = ?, attempts = ?, error = NULL WHERE id = ?",
+                                   (self.DONE, attempts + 1, upload_id))
+
+
+if __name__ == '__main__':
+    from utils.media_uploaders.reel_uploader import ReelUploader
+
+    UploadQueue().drain(ReelUploader.upload_file, forever=True)
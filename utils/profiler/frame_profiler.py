@@ -0,0 +1,142 @@
+import json
+import os
+import time
+
+import numpy as np
+import pygame
+
+from utils import fonts
+from utils.colors import Color
+
+
+class FrameProfiler:
+    """
+    Times the stages of every frame of the game loop.
+
+    The durations of the last `capacity` frames are kept in a preallocated ring buffer, one column per stage, so
+    timing the frames allocates nothing while the game runs, and the overlay reads the ring in place. A frame
+    misses its deadline when its work (every stage but the frame limiter's `tick`) takes longer than 1 / `fps`
+    seconds. A disabled profiler times nothing.
+    """
+    STAGES = ("events", "physics", "render", "present", "capture", "tick")
+    COLUMNS = ("stage", "p50", "p95", "p99", "max", "missed")
+    _OVERLAY_FRAMES = 60
+
+    def __init__(self, fps: float, capacity: int = 4096, enabled: bool = True):
+        """
+        Initialize a FrameProfiler.
+
+        :param fps (float): The target frame rate, which sets the frame budget.
+        :param capacity (int, optional): The number of frames kept. Defaults to 4096.
+        :param enabled (bool, optional): Whether to time the frames. Defaults to True.
+        """
+        self.fps = fps
+        self.enabled = enabled
+        self.frames = 0
+        self._durations = np.zeros((capacity, len(self.STAGES)), dtype=np.float64)
+        self._columns = {stage: i for i, stage in enumerate(self.STAGES)}
+        self._last = 0.0
+
+    @property
+    def budget(self) -> float:
+        return 1.0 / self.fps
+
+    def start_frame(self):
+        if not self.enabled: return
+        self._durations[self.frames % len(self._durations)] = 0.0
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str):
+        """
+        Add the time since the last lap (or the start of the frame) to the stage of the current frame.
+        """
+        if not self.enabled: return
+        now = time.perf_counter()
+        self._durations[self.frames % len(self._durations), self._columns[stage]] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        if self.enabled: self.frames += 1
+
+    @property
+    def durations(self) -> np.ndarray:
+        """
+        The stage durations (in seconds) of the kept frames, oldest first, of shape (frames, stages).
+        """
+        if self.frames <= len(self._durations): return self._durations[:self.frames]
+        i = self.frames % len(self._durations)  # The write index, where the oldest kept frame is
+        return np.concatenate((self._durations[i:], self._durations[:i]))
+
+    def recent_means(self, n: int) -> np.ndarray:
+        """
+        The mean duration (in seconds) of every stage over the last `n` frames, read from the ring in place.
+        """
+        n = min(n, self.frames, len(self._durations))
+        if not n: return np.zeros(len(self.STAGES))
+        i = self.frames % len(self._durations)
+        total = self._durations[max(i - n, 0):i].sum(axis=0)
+        if n > i: total += self._durations[len(self._durations) - (n - i):].sum(axis=0)
+        return total / n
+
+    def stats(self) -> dict:
+        """
+        The p50, p95, p99 and max duration (ms) of every stage and of the frame work, the number of missed
+        deadlines, and the mean duration of every stage over the frames that missed their deadline.
+        """
+        durations = self.durations * 1000
+        work = durations[:, [self._columns[s] for s in self.STAGES if s != "tick"]].sum(axis=1)
+        missed = work > self.budget * 1000
+
+        def percentiles(values: np.ndarray) -> dict:
+            if not len(values): return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+            p50, p95, p99 = np.percentile(values, (50, 95, 99))
+            return {"p50": round(p50, 3), "p95": round(p95, 3), "p99": round(p99, 3), "max": round(values.max(), 3)}
+
+        return {
+            "frames": len(durations),
+            "budget_ms": round(self.budget * 1000, 3),
+            "missed": int(missed.sum()),
+            "stages": {stage: percentiles(durations[:, i]) | {
+                "missed_mean": round(durations[missed, i].mean(), 3) if missed.any() else 0.0
+            } for stage, i in self._columns.items()},
+            "work": percentiles(work),
+        }
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.stats(), f, indent=4)
+
+    def format_table(self) -> str:
+        stats = self.stats()
+        rows = [(stage, values) for stage, values in stats["stages"].items()] + [("work", stats["work"])]
+        cells = [[stage] + [f"{values[c]:.2f}" for c in self.COLUMNS[1:5]] +
+                 [f"{values['missed_mean']:.2f}" if "missed_mean" in values else str(stats["missed"])]
+                 for stage, values in rows]
+        widths = [max([len(c)] + [len(r[i]) for r in cells]) for i, c in enumerate(self.COLUMNS)]
+        lines = [
+            f"{stats['frames']} frames, budget {stats['budget_ms']:.2f} ms, {stats['missed']} missed deadlines "
+            f"(ms, `missed` is the mean stage duration of the missed frames)",
+            " | ".join(c.ljust(w) for c, w in zip(self.COLUMNS, widths)),
+            "-+-".join("-" * w for w in widths),
+            *[" | ".join(c.ljust(w) for c, w in zip(r, widths)) for r in cells],
+        ]
+        return "\n".join(lines)
+
+    def draw_overlay(self, surface: pygame.Surface, position: tuple[int, int] = (5, 5)) -> pygame.Rect:
+        """
+        Draw the mean duration of every stage over the last frames on the surface.
+
+        The timings change every frame, so they are rendered with the font directly rather than through the shared
+        text cache, which they would only fill with one-off surfaces.
+
+        :return pygame.Rect: The region covered by the overlay.
+        """
+        font = fonts.get_font(size=16)
+        x, y = position
+        rect = pygame.Rect(x, y, 0, 0)
+        for stage, mean in zip(self.STAGES, self.recent_means(self._OVERLAY_FRAMES) * 1000):
+            text = font.render(f"{stage} {mean:.2f} ms", True, Color.BLACK.value)
+            rect.union_ip(surface.blit(text, (x, y)))
+            y += text.get_height()
+        return rect
@@ -0,0 +1,63 @@
+import json
+import os
+import platform
+import time
+from contextlib import contextmanager, nullcontext
+
+import pygame
+import pymunk
+
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+
+
+class StartupProfiler:
+    """
+    Times the phases of a game's launch and shutdown.
+
+    Every phase is timed with `phase`, in the order it runs; a disabled profiler times nothing. The report holds the
+    duration of every phase and the library versions, so reports of different versions can be compared.
+    """
+    COLUMNS = ("phase", "ms", "%")
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.phases: list[tuple[str, float]] = []
+
+    def phase(self, name: str):
+        """
+        Context manager timing the phase `name`.
+        """
+        return self._time(name) if self.enabled else nullcontext()
+
+    @contextmanager
+    def _time(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def report(self) -> dict:
+        return {
+            "phases": {name: round(duration * 1000, 3) for name, duration in self.phases},
+            "total_ms": round(sum(duration for _, duration in self.phases) * 1000, 3),
+            "versions": {"python": platform.python_version(), "pygame": pygame.version.ver,
+                         "pymunk": pymunk.version},
+        }
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=4)
+
+    def format_table(self) -> str:
+        total = sum(duration for _, duration in self.phases) or 1.0
+        cells = [[name, f"{duration * 1000:.2f}", f"{100 * duration / total:.1f}"] for name, duration in self.phases]
+        cells.append(["total", f"{total * 1000:.2f}", "100.0"])
+        widths = [max([len(c)] + [len(r[i]) for r in cells]) for i, c in enumerate(self.COLUMNS)]
+        lines = [
+            " | ".join(c.ljust(w) for c, w in zip(self.COLUMNS, widths)),
+            "-+-".join("-" * w for w in widths),
+            *[" | ".join(c.ljust(w) for c, w in zip(r, widths)) for r in cells],
+        ]
+        return "\n".join(lines)
@@ -0,0 +1,106 @@
+import json
+import os
+import struct
+import zlib
+from typing import Iterable
+
+import numpy as np
+import pymunk
+
+REPLAY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "replays")
+
+
+class ReplayLog:
+    """
+    Compact record of a game: the position and velocity of every dynamic body after each physics step, and the
+    sounds played during the game with the step they were played at.
+
+    The log is saved as a small header followed by the zlib-compressed, delta-encoded bit patterns of the states,
+    so it is lossless and a replay can be compared bit for bit with a new simulation of the same level. The events
+    follow as compressed JSON.
+    """
+    _MAGIC = b"GRPL"
+    _VERSION = 2
+    # magic, version, number of bodies, number of steps, step duration, size of the compressed states
+    _HEADER = struct.Struct("<4sHIIdI")
+
+    def __init__(self, n_bodies: int, dt: float):
+        """
+        Initialize an empty ReplayLog.
+
+        :param n_bodies (int): The number of recorded bodies.
+        :param dt (float): The duration of a physics step in seconds.
+        """
+        self.n_bodies = n_bodies
+        self.dt = dt
+        self.events: list[tuple[int, str]] = []
+        self._records = []
+        self._states = None
+
+    def record(self, bodies: Iterable[pymunk.Body]):
+        """
+        Append the current (x, y, vx, vy) of every body, in the same order on every call.
+        """
+        self._records.append(np.array([(*body.position, *body.velocity) for body in bodies], dtype=np.float64))
+        self._states = None
+
+    @property
+    def states(self) -> np.ndarray:
+        """
+        The recorded states as an array of shape (steps, bodies, 4), holding x, y, vx, vy.
+        """
+        if self._states is None:
+            self._states = np.stack(self._records) if self._records else np.empty((0, self.n_bodies, 4))
+        return self._states
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self.states[:, :, :2]
+
+    @property
+    def velocities(self) -> np.ndarray:
+        return self.states[:, :, 2:]
+
+    def positions_at(self, t: float) -> np.ndarray:
+        """
+        The positions of the bodies at time `t` (seconds), interpolated between the surrounding steps.
+
+        Allows re-rendering the game at any frame rate without simulating it again.
+        """
+        positions = self.positions
+        i = min(max(t / self.dt, 0.0), len(positions) - 1)
+        low = int(i)
+        high = min(low + 1, len(positions) - 1)
+        return positions[low] + (positions[high] - positions[low]) * (i - low)
+
+    def save(self, path: str):
+        states = self.states
+        bits = states.view(np.int64)
+        deltas = np.diff(bits, axis=0, prepend=np.zeros((1, *bits.shape[1:]), dtype=np.int64))
+        compressed_states = zlib.compress(deltas.tobytes(), 9)
+        with open(path, "wb") as f:
+            f.write(self._HEADER.pack(self._MAGIC, self._VERSION, self.n_bodies, len(states), self.dt,
+                                      len(compressed_states)))
+            f.write(compressed_states)
+            f.write(zlib.compress(json.dumps(self.events).encode(), 9))
+
+    @classmethod
+    def load(cls, path: str) -> "ReplayLog":
+        with open(path, "rb") as f:
+            magic, version, n_bodies, steps, dt, states_size = cls._HEADER.unpack(f.read(cls._HEADER.size))
+            if magic != cls._MAGIC or version != cls._VERSION:
+                raise ValueError(f"{path} is not a version {cls._VERSION} replay log")
+            deltas = np.frombuffer(zlib.decompress(f.read(states_size)), dtype=np.int64).reshape((steps, n_bodies, 4))
+            events = json.loads(zlib.decompress(f.read()))
+        replay = cls(n_bodies, dt)
+        replay.events = [(step, sound) for step, sound in events]
+        replay._states = np.cumsum(deltas, axis=0, dtype=np.int64).view(np.float64)
+        replay._records = list(replay._states)
+        return replay
+
+    def __eq__(self, other: "ReplayLog") -> bool:
+        return isinstance(other, ReplayLog) and self.dt == other.dt and self.events == other.events and \
+            self.states.shape == other.states.shape and self.states.tobytes() == other.states.tobytes()
+
+    def __len__(self) -> int:
+        return len(self.states)
@@ -1,12 +1,54 @@
 import os
+import wave
 from enum import Enum
 
+import numpy as np
 import pygame
 
-DIR = R"C:\ws\pygame_projects\utils\sounds"
+DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sounds")
+
+_loaded = dict()
+
+
+def clear_cache():
+    """
+    Forget every loaded sound. Must be called before `pygame.quit()`, which closes the mixer they were loaded into.
+    """
+    _loaded.clear()
 
 
 class Sound(Enum):
-    pygame.mixer.init()
-    HIT = pygame.mixer.Sound(os.path.join(DIR, "tap.wav"))
-    WIN = pygame.mixer.Sound(os.path.join(DIR, "treasure.wav"))
+    """
+    The game sounds, by file name in the `sounds` folder.
+
+    Sounds are loaded, and the mixer initialized, on first play, so importing the games needs no audio device and
+    no sound files. If the mixer cannot be initialized, playing a sound does nothing.
+    """
+    HIT = "tap.wav"
+    WIN = "treasure.wav"
+
+    @property
+    def path(self) -> str:
+        return os.path.join(DIR, self.value)
+
+    def play(self):
+        sound = _loaded.get(self)
+        if sound is None:
+            if not pygame.mixer.get_init():
+                try:
+                    pygame.mixer.init()
+                except pygame.error:
+                    return
+            sound = _loaded[self] = pygame.mixer.Sound(self.path)
+        sound.play()
+
+    def read_samples(self) -> tuple[int, np.ndarray]:
+        """
+        Read the sound's 16-bit samples from its file, without the mixer.
+
+        :return tuple[int, np.ndarray]: The sample rate and the samples, of shape (frames, channels).
+        """
+        with wave.open(self.path, "rb") as f:
+            if f.getsampwidth() != 2: raise ValueError(f"{self.path} is not a 16-bit WAV file")
+            samples = np.frombuffer(f.readframes(f.getnframes()), dtype="<i2").reshape((-1, f.getnchannels()))
+            return f.getframerate(), samples